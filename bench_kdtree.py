@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for kdtree.KDTree
+
+    python bench_kdtree.py build [n] [max_workers]   parallel build speedup vs. worker count
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from kdtree import KDTree
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def bench_build(n=10_000_000, max_workers=None):
+    """Build the same n 3-D points with 1, 2, 4, ... worker processes"""
+    max_workers = max_workers or os.cpu_count()
+    points = np.random.default_rng(0).random((n, 3))
+    print(f"parallel build: {n:,} 3-D points, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        seconds, _ = timed(KDTree.from_array, points, workers=workers)
+        baseline = baseline or seconds
+        print(f"{workers:>8} {seconds:>10.2f} {baseline / seconds:>7.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "build"
+    args = [int(arg) for arg in sys.argv[2:]]
+    {"build": bench_build}[name](*args)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for max_heap
+
+    python bench_max_heap.py arity [n]   d-ary heap (d = 2, 4, 8) across insert / delete mixes
+"""
+
+import random
+import sys
+import time
+
+from max_heap import DaryHeap, Heap
+
+
+def run_mix(heap, operations):
+    """operations is a list of values to insert, with None meaning delete_root"""
+    start = time.perf_counter()
+    insert, delete_root = heap.insert, heap.delete_root
+    for value in operations:
+        if value is None:
+            delete_root()
+        else:
+            insert(value)
+    return time.perf_counter() - start
+
+
+def make_operations(n, insert_ratio, seed=0):
+    """n operations after an n / 2 element warm-up, roughly insert_ratio of them inserts"""
+    rng = random.Random(seed)
+    warm_up = [rng.random() for _ in range(n // 2)]
+    operations = [rng.random() if rng.random() < insert_ratio else None for _ in range(n)]
+    return warm_up, operations
+
+
+def bench_arity(n=200_000):
+    """Time insert-heavy, balanced and delete-heavy mixes for Heap and DaryHeap(2 / 4 / 8)"""
+    mixes = [("insert-heavy 90/10", 0.9), ("balanced 50/50", 0.5), ("delete-heavy 20/80", 0.2)]
+    heaps = [("Heap", lambda: Heap())] + [(f"DaryHeap({d})", lambda d=d: DaryHeap(d)) for d in (2, 4, 8)]
+
+    print(f"d-ary heap: {n:,} operations per mix (seconds)")
+    print(f"{'':>14}" + "".join(f"{name:>22}" for name, _ in mixes))
+    for label, make in heaps:
+        row = []
+        for _, ratio in mixes:
+            warm_up, operations = make_operations(n, ratio)
+            heap = make()
+            heap.push_many(warm_up)
+            row.append(run_mix(heap, operations))
+        print(f"{label:>14}" + "".join(f"{seconds:>22.3f}" for seconds in row))
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "arity"
+    args = [int(arg) for arg in sys.argv[2:]]
+    {"arity": bench_arity}[name](*args)
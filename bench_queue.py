@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for queue
+
+    python bench_queue.py rss [cycles] [depth]   resident memory over enqueue/dequeue cycles at a steady depth
+    python bench_queue.py batch [n] [size]       n items in batches: per-item calls vs. enqueue_many / dequeue_many
+    python bench_queue.py shared [n]             n records between two processes: multiprocessing.Queue vs. SharedMemoryQueue
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+from queue import Queue, SharedMemoryQueue
+
+
+def resident_mb():
+    """Current resident set size, read from /proc on Linux"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def bench_rss(cycles=100_000_000, depth=10):
+    """One enqueue and one dequeue per cycle with depth elements queued; RSS should stay flat"""
+    queue = Queue()
+    for ele in range(depth):
+        queue.enqueue(ele)
+    checkpoints = 10
+    step = cycles // checkpoints
+    print(f"queue RSS: {cycles:,} cycles at depth {depth}")
+    print(f"{'cycles':>14} {'RSS MB':>8} {'capacity':>9} {'cycles/s':>12}")
+    print(f"{0:>14,} {resident_mb():>8.1f} {len(queue.arr):>9,}")
+    enqueue, dequeue = queue.enqueue, queue.dequeue
+    for checkpoint in range(1, checkpoints + 1):
+        start = time.perf_counter()
+        for ele in range(step):
+            enqueue(ele)
+            dequeue()
+        rate = step / (time.perf_counter() - start)
+        print(f"{checkpoint * step:>14,} {resident_mb():>8.1f} {len(queue.arr):>9,} {rate:>12,.0f}")
+
+
+def bench_batch(n=1_000_000, size=1_000):
+    """Move n items through the queue in batches of size, one call per item vs. one per batch"""
+    items = list(range(size))
+    rounds = n // size
+    print(f"queue batches: {rounds * size:,} items in batches of {size:,}")
+
+    queue = Queue()
+    enqueue, dequeue = queue.enqueue, queue.dequeue
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for ele in items:
+            enqueue(ele)
+        for _ in range(size):
+            dequeue()
+    single = time.perf_counter() - start
+
+    queue = Queue()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        queue.enqueue_many(items)
+        queue.dequeue_many(size)
+    batched = time.perf_counter() - start
+
+    print(f"{'per item':>10} {single:>8.3f} s")
+    print(f"{'batched':>10} {batched:>8.3f} s  {single / batched:.1f}x")
+
+
+RECORD = "<qdd"  # id, timestamp, value
+
+
+def send_pickled(queue, n):
+    for i in range(n):
+        queue.put((i, 0.5, 1.5))
+    queue.put(None)
+
+
+def send_records(queue, n):
+    for i in range(n):
+        queue.put((i, 0.5, 1.5))
+    queue.close()
+
+
+def send_batches(queue, n, size=256):
+    batch = [(0, 0.5, 1.5)] * size
+    sent = 0
+    while sent < n:
+        written = queue.put_many(batch[:n - sent])
+        sent += written
+        if not written:
+            time.sleep(0)
+    queue.close()
+
+
+def bench_shared(n=1_000_000):
+    """Records per second from a producer process to this one"""
+    context = multiprocessing.get_context()
+    print(f"inter-process records: {n:,} records of {RECORD!r}, {os.cpu_count()} cores")
+
+    queue = context.Queue(maxsize=4096)
+    start = time.perf_counter()
+    producer = context.Process(target=send_pickled, args=(queue, n))
+    producer.start()
+    while queue.get() is not None:
+        pass
+    producer.join()
+    print(f"{'multiprocessing.Queue':>24} {n / (time.perf_counter() - start):>12,.0f} records/s")
+
+    for name, sender in (("SharedMemoryQueue", send_records), ("SharedMemoryQueue many", send_batches)):
+        queue = SharedMemoryQueue(RECORD, 4096)
+        start = time.perf_counter()
+        producer = context.Process(target=sender, args=(queue, n))
+        producer.start()
+        received = 0
+        while received < n:
+            records = queue.get_many(256)
+            received += len(records)
+            if not records:
+                time.sleep(0)
+        producer.join()
+        print(f"{name:>24} {n / (time.perf_counter() - start):>12,.0f} records/s")
+        queue.close()
+        queue.unlink()
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "rss"
+    args = [int(arg) for arg in sys.argv[2:]]
+    {"rss": bench_rss, "batch": bench_batch, "shared": bench_shared}[name](*args)
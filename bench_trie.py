@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for trie
+
+    python bench_trie.py memory [n]   bytes per key: dict-per-node layout vs. slotted nodes vs. frozen
+    python bench_trie.py radix [n]    nodes and lookup time on URL keys: Trie vs. RadixTrie
+    python bench_trie.py complete [n] top-10 autocomplete: complete() vs. sorting starts_with()
+    python bench_trie.py build [n]    build from a sorted word file: insert() loop vs. from_sorted(), collector on and off
+    python bench_trie.py load [n]     startup: rebuilding from a word list vs. mapping a saved FrozenTrie
+    python bench_trie.py batch [n]    n skewed token lookups: trieSearch loop vs. trie_search_many
+    python bench_trie.py fuzzy [n]    typo-tolerant lookups: edit distance to every word vs. fuzzy_search
+    python bench_trie.py scan [n]     find 5,000 terms in n characters: trieSearch on every substring vs. AhoCorasick
+    python bench_trie.py churn [n] [rounds]
+                                      resident memory while n live words are replaced, a tenth per round
+    python bench_trie.py concurrent [n] [max_threads]
+                                      read throughput per reader thread count while a writer inserts;
+                                      run under free-threaded 3.13t (python3.13t -X gil=0) to see scaling
+"""
+
+import random
+import string
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from trie import AhoCorasick, ConcurrentTrie, FrozenTrie, RadixTrie, Trie, trie_search_many, trieSearch
+
+
+class DictNode:
+    """The node layout before slots: a __dict__ and a children dict on every node"""
+
+    def __init__(self, is_entry=False):
+        self.is_entry = is_entry
+        self.children = {}
+
+
+def insert_dict_nodes(root, word):
+    current = root
+    for char in word:
+        if char not in current.children:
+            current.children[char] = DictNode()
+        current = current.children[char]
+    current.is_entry = True
+
+
+def make_words(n, seed=0):
+    """n distinct lowercase words of 4 to 12 letters"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12))))
+    return list(words)
+
+
+def make_urls(n, seed=0):
+    """n URL-like keys sharing hosts and path prefixes"""
+    rng = random.Random(seed)
+    hosts = [f"https://{name}.example.com" for name in ("api", "www", "static", "auth", "cdn")]
+    sections = ["users", "orders", "products", "search", "assets/img", "v2/reports"]
+    return [
+        f"{rng.choice(hosts)}/{rng.choice(sections)}/{rng.randrange(10**6)}/details?ref={rng.randrange(100)}"
+        for _ in range(n)
+    ]
+
+
+def count_nodes(root):
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children.values())
+    return count
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, and the time it took"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, seconds, result
+
+
+def bench_memory(n=1_000_000):
+    """Resident size of n words in each trie representation"""
+    words = make_words(n)
+    print(f"trie memory: {n:,} words")
+    print(f"{'layout':>12} {'MB':>10} {'bytes/key':>10} {'seconds':>8}")
+
+    def build_dict_nodes():
+        root = DictNode()
+        for word in words:
+            insert_dict_nodes(root, word)
+        return root
+
+    def build_slotted():
+        trie = Trie()
+        for word in words:
+            trie.insert(word)
+        return trie
+
+    size, seconds, root = measure(build_dict_nodes)
+    print(f"{'dict nodes':>12} {size / 2**20:>10.1f} {size / n:>10.1f} {seconds:>8.2f}")
+    del root
+
+    size, seconds, trie = measure(build_slotted)
+    print(f"{'slots':>12} {size / 2**20:>10.1f} {size / n:>10.1f} {seconds:>8.2f}")
+
+    size, seconds, frozen = measure(trie.freeze)
+    print(f"{'frozen':>12} {size / 2**20:>10.1f} {size / n:>10.1f} {seconds:>8.2f}")
+
+
+def bench_radix(n=200_000):
+    """Node count and lookup time for n URL keys"""
+    urls = make_urls(n)
+    probes = urls[: n // 2] + make_urls(n // 2, seed=1)
+    print(f"radix trie: {n:,} URLs, {len(probes):,} lookups, mean length {sum(map(len, urls)) / n:.0f}")
+    print(f"{'layout':>9} {'nodes':>12} {'build s':>8} {'lookup s':>9}")
+    for layout in (Trie, RadixTrie):
+        trie = layout()
+        start = time.perf_counter()
+        for url in urls:
+            trie.insert(url)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for url in probes:
+            trieSearch(trie, url)
+        lookup = time.perf_counter() - start
+        print(f"{layout.__name__:>9} {count_nodes(trie.root):>12,} {build:>8.2f} {lookup:>9.2f}")
+
+
+def bench_complete(n=500_000, k=10):
+    """Queries per second for top-k completions of short prefixes"""
+    rng = random.Random(0)
+    trie = Trie()
+    for word in make_words(n):
+        trie.insert(word, rng.random())
+    prefixes = ["".join(rng.choices(string.ascii_lowercase, k=length)) for length in (1, 2, 3) for _ in range(50)]
+    print(f"autocomplete: {n:,} words, top {k}, {len(prefixes)} prefixes of 1-3 letters")
+
+    def by_sorting(prefix):
+        words = [(word, trie._find(word).weight) for word in trie.starts_with(prefix)]
+        return sorted(words, key=lambda pair: -pair[1])[:k]
+
+    for name, query in (("complete", lambda prefix: trie.complete(prefix, k)), ("sorting", by_sorting)):
+        start = time.perf_counter()
+        for prefix in prefixes:
+            query(prefix)
+        seconds = time.perf_counter() - start
+        print(f"{name:>10} {len(prefixes) / seconds:>10,.0f} queries/s")
+
+
+def bench_build(n=1_000_000):
+    """Build a trie from a sorted file of n words, streamed line by line"""
+    with tempfile.TemporaryFile("w+") as file:
+        file.writelines(word + "\n" for word in sorted(make_words(n)))
+        print(f"trie build: {n:,} sorted words from a file")
+
+        def insert_loop(lines):
+            trie = Trie()
+            for line in lines:
+                trie.insert(line.rstrip("\n"))
+            return trie
+
+        def from_sorted(lines):
+            return Trie.from_sorted(line.rstrip("\n") for line in lines)
+
+        def insert_loop_paused(lines):
+            gc.disable()
+            try:
+                return insert_loop(lines)
+            finally:
+                gc.enable()
+
+        def from_sorted_paused(lines):
+            return Trie.from_sorted((line.rstrip("\n") for line in lines), pause_gc=True)
+
+        # the collector, not the loop, sets the pace, so each build is also timed with it paused
+        builds = (
+            ("insert", insert_loop),
+            ("from_sorted", from_sorted),
+            ("insert, gc off", insert_loop_paused),
+            ("pause_gc", from_sorted_paused),
+        )
+        for name, build in builds:
+            file.seek(0)
+            gc.collect()
+            start = time.perf_counter()
+            build(file)
+            print(f"{name:>14} {time.perf_counter() - start:>8.2f} s")
+
+
+def bench_load(n=1_000_000):
+    """Time to a first answered query: rebuild from words vs. load() a saved file"""
+    words = sorted(make_words(n))
+    probes = make_words(10_000, seed=1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "words.trie")
+        Trie.from_sorted(words).freeze().save(path)
+        print(f"trie startup: {n:,} words, file {os.path.getsize(path) / 2**20:.1f} MB")
+
+        start = time.perf_counter()
+        trie = Trie.from_sorted(words)
+        print(f"{'rebuild':>8} {time.perf_counter() - start:>10.4f} s")
+
+        start = time.perf_counter()
+        loaded = FrozenTrie.load(path)
+        print(f"{'load':>8} {time.perf_counter() - start:>10.4f} s")
+
+        for name, target in (("rebuilt", trie), ("mapped", loaded)):
+            start = time.perf_counter()
+            for word in probes:
+                trieSearch(target, word)
+            print(f"{name:>8} {len(probes) / (time.perf_counter() - start):>10,.0f} lookups/s")
+        loaded.close()
+
+
+def bench_batch(n=1_000_000, words=200_000):
+    """n lookups, half Zipf-distributed and half uniform, over a vocabulary half in the trie"""
+    rng = random.Random(0)
+    vocabulary = make_words(2 * words)
+    trie = Trie.from_sorted(sorted(vocabulary[:words]))
+    tokens = [
+        vocabulary[min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)]
+        if rng.random() < 0.5 else rng.choice(vocabulary)
+        for _ in range(n)
+    ]
+    print(f"batched lookups: {n:,} tokens, {len(set(tokens)):,} distinct, {words:,} words")
+    for target in (trie, trie.freeze()):
+        start = time.perf_counter()
+        for token in tokens:
+            trieSearch(target, token)
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        trie_search_many(target, tokens)
+        batch = time.perf_counter() - start
+        print(f"{type(target).__name__:>10} trieSearch {single:>6.2f} s   trie_search_many {batch:>6.2f} s")
+
+
+def edit_distance(a, b):
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+def bench_fuzzy(n=100_000, queries=20):
+    """Words within 1 and 2 edits of misspelt queries"""
+    rng = random.Random(0)
+    words = make_words(n)
+    trie = Trie.from_sorted(sorted(words))
+    typos = []
+    for word in rng.sample(words, queries):
+        position = rng.randrange(len(word))
+        typos.append(word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:])
+    print(f"fuzzy search: {n:,} words, {queries} queries")
+    for max_edits in (1, 2):
+        start = time.perf_counter()
+        for query in typos:
+            trie.fuzzy_search(query, max_edits)
+        pruned = (time.perf_counter() - start) / queries
+        start = time.perf_counter()
+        for query in typos[:3]:
+            [word for word in words if edit_distance(query, word) <= max_edits]
+        brute = (time.perf_counter() - start) / 3
+        print(f"  max_edits={max_edits}: fuzzy_search {pruned * 1000:>8.1f} ms   every word {brute * 1000:>8.1f} ms")
+
+
+def bench_scan(n=1_000_000, terms=5_000):
+    """Every occurrence of terms dictionary words in n characters of text"""
+    rng = random.Random(0)
+    words = make_words(terms)
+    trie = Trie.from_sorted(sorted(words))
+    pieces, length = [], 0
+    while length < n:
+        piece = rng.choice(words) if rng.random() < 0.1 else "".join(rng.choices(string.ascii_lowercase + " ", k=8))
+        pieces.append(piece)
+        length += len(piece)
+    text = "".join(pieces)[:n]
+    longest = max(map(len, words))
+    print(f"text scan: {len(text):,} characters, {terms:,} terms of up to {longest} letters")
+
+    start = time.perf_counter()
+    matcher = AhoCorasick(trie)
+    print(f"{'build':>10} {time.perf_counter() - start:>8.2f} s")
+
+    start = time.perf_counter()
+    found = sum(1 for _ in matcher.find(text))
+    print(f"{'automaton':>10} {time.perf_counter() - start:>8.2f} s  {found:,} matches")
+
+    start = time.perf_counter()
+    found = sum(
+        trieSearch(trie, text[i:j])
+        for i in range(len(text))
+        for j in range(i + 1, min(i + longest, len(text)) + 1)
+    )
+    print(f"{'substrings':>10} {time.perf_counter() - start:>8.2f} s  {found:,} matches")
+
+
+def resident_mb():
+    """Current resident set size, read from /proc on Linux"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def bench_churn(n=200_000, rounds=30):
+    """Insert and delete a tenth of n live words per round; RSS should stay flat"""
+    rng = random.Random(1)
+    trie = Trie()
+    live = make_words(n)
+    for word in live:
+        trie.insert(word)
+    batch = n // 10
+    print(f"trie churn: {n:,} live words, {batch:,} inserts and deletes per round")
+    print(f"{'round':>6} {'words':>10} {'RSS MB':>8} {'seconds':>8}")
+    print(f"{0:>6} {len(trie):>10,} {resident_mb():>8.1f}")
+    for round_number in range(1, rounds + 1):
+        start = time.perf_counter()
+        for i in rng.sample(range(n), batch):
+            trie.delete(live[i])
+            word = live[i]
+            while trieSearch(trie, word) or word == live[i]:
+                word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+            trie.insert(word)
+            live[i] = word
+        print(f"{round_number:>6} {len(trie):>10,} {resident_mb():>8.1f} {time.perf_counter() - start:>8.2f}")
+
+
+def bench_concurrent(n=100_000, max_threads=8, seconds=2.0):
+    """Lookups per second across reader threads, with one writer inserting throughout"""
+    words = make_words(2 * n)
+    trie = ConcurrentTrie.from_sorted(sorted(words[:n]))
+    probes = words[: n // 10]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"concurrent trie: {n:,} words, 1 writer, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'readers':>8} {'lookups/s':>12} {'scaling':>8} {'inserts/s':>10}")
+
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        stop = threading.Event()
+        lookups = [0] * threads
+        inserted = [0]
+
+        def read(slot):
+            count = 0
+            while not stop.is_set():
+                for word in probes:
+                    trieSearch(trie, word)
+                count += len(probes)
+            lookups[slot] = count
+
+        def write():
+            for word in words[n:]:
+                if stop.is_set():
+                    break
+                trie.insert(word)
+                inserted[0] += 1
+
+        workers = [threading.Thread(target=read, args=(slot,)) for slot in range(threads)]
+        workers.append(threading.Thread(target=write))
+        for worker in workers:
+            worker.start()
+        time.sleep(seconds)
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+        rate = sum(lookups) / seconds
+        baseline = baseline or rate
+        print(f"{threads:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x {inserted[0] / seconds:>10,.0f}")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "memory"
+    args = [int(arg) for arg in sys.argv[2:]]
+    {"memory": bench_memory, "radix": bench_radix, "complete": bench_complete, "build": bench_build, "load": bench_load, "batch": bench_batch, "fuzzy": bench_fuzzy, "concurrent": bench_concurrent, "scan": bench_scan, "churn": bench_churn}[name](*args)
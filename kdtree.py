@@ -1,5 +1,17 @@
+import heapq
 import math
+import multiprocessing
+import struct
+from array import array
+from multiprocessing import shared_memory
 from pprint import pprint 
+
+from mapped_arrays import load_arrays, release_arrays, save_arrays
+
+try:
+	import numpy as np
+except ImportError:  # numpy is only needed by KDTree.from_array / KDTree.knn_batch
+	np = None
 """
 K-d tree
 
@@ -26,10 +38,618 @@ def kdtree(points, depth, k):
 		"rightChild": kdtree(sort[mid+1:], depth + 1, k)
 	}
 
-points = [
-	(0, 0),
-	(1, 0),
-	(2, 2)
-]
 
-pprint(kdtree(points, 0, 2))
+# On-disk index: header, then the node arrays back to back in the order of _SAVED_ARRAYS.
+# The 8-byte arrays come first so every array starts aligned for memoryview.cast.
+_MAGIC = b"KDTR"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIIIqqqq")  # magic, version, k, reserved, root, count, next_id, slots
+_SAVED_ARRAYS = (("coords", "d"), ("ids", "q"), ("left", "q"), ("right", "q"), ("sizes", "q"), ("axes", "b"), ("packed", "b"))
+
+# knn_batch bounds this many queries at a time, so its temporaries do not grow with the batch
+_HOME_CHUNK = 4096
+
+
+def _select(order, lo, hi, nth, column):
+	"""Partition order[lo:hi] in place so that order[nth] indexes the nth smallest value of column (quickselect)."""
+	hi -= 1
+	while lo < hi:
+		mid = (lo + hi) // 2
+		# median-of-three pivot keeps already sorted input linear
+		a, b, c = column[order[lo]], column[order[mid]], column[order[hi]]
+		if a < b:
+			pivot = b if b < c else (c if a < c else a)
+		else:
+			pivot = a if a < c else (c if b < c else b)
+
+		i, j = lo, hi
+		while i <= j:
+			while column[order[i]] < pivot:
+				i += 1
+			while column[order[j]] > pivot:
+				j -= 1
+			if i <= j:
+				order[i], order[j] = order[j], order[i]
+				i += 1
+				j -= 1
+
+		if nth <= j:
+			hi = j
+		elif nth >= i:
+			lo = i
+		else:
+			return
+
+
+def _partition_levels(pts, order, axes, left, right, sizes, lo, hi, depth, stop_depth=None):
+	"""
+	Level-by-level NumPy version of KDTree._append_block.
+
+	lo / hi hold the [lo, hi) ranges of every subtree at depth. Ranges on one level differ in
+	size by at most one, so each level is at most two argpartition calls over a 2-D view.
+	Stops before stop_depth and returns the ranges that are still unbuilt.
+	"""
+	k = pts.shape[1]
+	while len(lo) and depth != stop_depth:
+		axis = depth % k
+		size = hi - lo
+		for s in np.unique(size):
+			rows = lo[size == s]
+			slots = rows[:, None] + np.arange(s)
+			block = order[slots]
+			part = np.argpartition(pts[block, axis], s // 2, axis=1)
+			order[slots] = np.take_along_axis(block, part, axis=1)
+
+		mid = lo + size // 2
+		axes[mid] = axis
+		sizes[mid] = size
+		left_size = mid - lo
+		right_size = hi - mid - 1
+		left[mid] = np.where(left_size > 0, lo + left_size // 2, -1)
+		right[mid] = np.where(right_size > 0, mid + 1 + right_size // 2, -1)
+
+		lo, hi = np.concatenate((lo, mid + 1)), np.concatenate((mid, hi))
+		keep = hi > lo
+		lo, hi = lo[keep], hi[keep]
+		depth += 1
+	return lo, hi, depth
+
+
+def _build_worker(names, n, k, lo, hi, depth):
+	"""Process entry point: finish the subtrees [lo, hi) in the shared buffers in place."""
+	blocks = [shared_memory.SharedMemory(name=name) for name in names]
+	shapes = ((n, k), n, n, n, n, n)
+	dtypes = (np.float64, np.int64, np.int8, np.int64, np.int64, np.int64)
+	views = [np.ndarray(shape, dtype=dtype, buffer=block.buf) for block, shape, dtype in zip(blocks, shapes, dtypes)]
+	try:
+		_partition_levels(*views, lo, hi, depth)
+	finally:
+		# views must go before the blocks they point into can be closed
+		views.clear()
+		for block in blocks:
+			block.close()
+
+
+def _parallel_partition_levels(pts, order, axes, left, right, sizes, workers):
+	"""
+	_partition_levels with the lower levels farmed out to worker processes.
+
+	The top levels are split here until there are a few independent subtrees per worker. Points
+	and the output arrays live in shared memory, so workers only receive the block names and their
+	[lo, hi) ranges, never the points. A subtree root's slot is fixed by its range, so the parent's
+	left / right links already point at every worker's result and no stitching pass is needed.
+
+	Processes are started directly instead of through multiprocessing.Pool, which imports the stdlib
+	queue module that this directory's queue.py shadows.
+	"""
+	n = len(pts)
+	arrays = (pts, order, axes, left, right, sizes)
+	blocks = [shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1)) for arr in arrays]
+	shared = [np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf) for arr, block in zip(arrays, blocks)]
+	try:
+		for i, arr in enumerate(arrays):
+			shared[i][...] = arr
+
+		top = max(1, (workers - 1).bit_length() + 2)
+		lo, hi, depth = _partition_levels(*shared, np.array([0]), np.array([n]), 0, stop_depth=top)
+
+		names = [block.name for block in blocks]
+		context = multiprocessing.get_context()
+		processes = [
+			context.Process(target=_build_worker, args=(names, n, pts.shape[1], lo[w::workers], hi[w::workers], depth))
+			for w in range(min(workers, len(lo)))
+		]
+		for process in processes:
+			process.start()
+		for process in processes:
+			process.join()
+		if any(process.exitcode != 0 for process in processes):
+			raise RuntimeError("k-d tree build worker failed")
+
+		for i in range(1, len(arrays)):
+			arrays[i][...] = shared[i]
+	finally:
+		shared.clear()
+		for block in blocks:
+			block.close()
+			block.unlink()
+
+
+class KDTree:
+	"""
+	Flat array-backed k-d tree.
+
+	Node i stores its point in coords[i * k:(i + 1) * k], its splitting axis in axes[i]
+	and its children in left[i] / right[i] (-1 for none). ids[i] is the position of
+	the node's point in the input sequence, or -1 once the node has been deleted.
+
+	sizes[i] counts the slots in node i's subtree. A subtree built in one go is packed:
+	its slots are exactly [i - sizes[i] // 2, i - sizes[i] // 2 + sizes[i]), which
+	packed[i] records and knn_batch uses to scan small subtrees as one block.
+
+	insert / delete keep the tree balanced scapegoat style: an insert that lands deeper
+	than log(1 / alpha) of the size rebuilds the lowest ancestor whose child holds more
+	than alpha of its slots, and once more than max_dead_ratio of all slots are deleted
+	or left behind by such rebuilds, the whole tree is rebuilt from the live points.
+	"""
+
+	alpha = 0.7
+	max_dead_ratio = 0.5
+
+	def __init__(self, points, k=None):
+		points = list(points)
+		n = len(points)
+		if k is None:
+			k = len(points[0]) if n else 0
+		self.k = k
+		self.count = n
+		self.next_id = n
+		self.mapped = None
+		self._reset()
+		self.root = self._append_block(points, range(n), 0)
+
+	def _reset(self):
+		self.root = -1
+		self.coords = array('d')
+		self.ids = array('q')
+		self.axes = array('b')
+		self.left = array('q')
+		self.right = array('q')
+		self.sizes = array('q')
+		self.packed = array('b')
+
+	def _append_block(self, points, ids, depth):
+		"""
+		Append points as a packed, balanced subtree whose root sits at depth and return the root slot.
+
+		Builds by median-partitioning an index array in place, so a node's slot is its final position.
+		"""
+		k = self.k
+		n = len(points)
+		base = len(self.ids)
+		if n == 0:
+			return -1
+		order = list(range(n))
+		columns = [[p[axis] for p in points] for axis in range(k)]
+		axes = [0] * n
+		left = [-1] * n
+		right = [-1] * n
+		sizes = [0] * n
+		stack = [(0, n, depth)]
+		while stack:
+			lo, hi, depth = stack.pop()
+			axis = depth % k
+			mid = (lo + hi) // 2
+			_select(order, lo, hi, mid, columns[axis])
+
+			axes[mid] = axis
+			sizes[mid] = hi - lo
+			if lo < mid:
+				left[mid] = base + (lo + mid) // 2
+				stack.append((lo, mid, depth + 1))
+			if mid + 1 < hi:
+				right[mid] = base + (mid + 1 + hi) // 2
+				stack.append((mid + 1, hi, depth + 1))
+
+		ids = list(ids)
+		for idx in order:
+			self.coords.extend(points[idx])
+			self.ids.append(ids[idx])
+		self.axes.extend(axes)
+		self.left.extend(left)
+		self.right.extend(right)
+		self.sizes.extend(sizes)
+		self.packed.extend(array('b', [1]) * n)
+		return base + n // 2
+
+	@classmethod
+	def from_array(cls, points, workers=1):
+		"""
+		Build from an (n, k) NumPy array with argpartition splits.
+
+		The tree has the same layout as one built from a sequence of tuples and is stored in the
+		same array.array buffers, so every query method works on it unchanged. With workers > 1
+		the lower levels are built by that many processes over shared memory.
+		"""
+		if np is None:
+			raise ImportError("KDTree.from_array requires numpy")
+		pts = np.asarray(points, dtype=np.float64)
+		if pts.ndim != 2:
+			raise ValueError(f"expected an (n, k) array, got shape {pts.shape}")
+		n, k = pts.shape
+		tree = cls([], k)
+		if n == 0:
+			return tree
+
+		order = np.arange(n, dtype=np.int64)
+		axes = np.zeros(n, dtype=np.int8)
+		left = np.full(n, -1, dtype=np.int64)
+		right = np.full(n, -1, dtype=np.int64)
+		sizes = np.zeros(n, dtype=np.int64)
+		if workers > 1:
+			_parallel_partition_levels(pts, order, axes, left, right, sizes, workers)
+		else:
+			_partition_levels(pts, order, axes, left, right, sizes, np.array([0]), np.array([n]), 0)
+
+		tree.root = n // 2
+		tree.count = tree.next_id = n
+		tree.coords.frombytes(np.ascontiguousarray(pts[order]).tobytes())
+		tree.ids.frombytes(order.tobytes())
+		tree.axes.frombytes(axes.tobytes())
+		tree.left.frombytes(left.tobytes())
+		tree.right.frombytes(right.tobytes())
+		tree.sizes.frombytes(sizes.tobytes())
+		tree.packed.frombytes(bytes([1]) * n)
+		return tree
+
+	def save(self, path):
+		"""Write the tree to path in the versioned binary format that load() maps back in."""
+		header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, self.k, 0, self.root, self.count, self.next_id, len(self.ids))
+		save_arrays(path, header, self, _SAVED_ARRAYS, "k-d tree index")
+
+	@classmethod
+	def load(cls, path):
+		"""
+		Open a tree written by save() with mmap, without deserializing it.
+
+		The node arrays are memoryviews straight into the mapped file, so queries read the page
+		cache directly and every process loading the same file shares one copy. The tree is
+		read-only; call close() to release the mapping.
+		"""
+		def lengths(fields):
+			k, slots = fields[2], fields[7]
+			return {"coords": slots * k, "ids": slots, "left": slots, "right": slots, "sizes": slots, "axes": slots, "packed": slots}
+
+		mapped, fields, views = load_arrays(path, _HEADER, _MAGIC, _FORMAT_VERSION, _SAVED_ARRAYS, lengths, "k-d tree index")
+		_, _, k, _, root, count, next_id, _ = fields
+		tree = cls([], k)
+		for name, view in views.items():
+			setattr(tree, name, view)
+		tree.root, tree.count, tree.next_id = root, count, next_id
+		tree.mapped = mapped
+		return tree
+
+	def close(self):
+		"""Release the file mapping of a tree opened with load(); the tree is empty afterwards."""
+		if self.mapped is None:
+			return
+		release_arrays(self, _SAVED_ARRAYS)
+		self.mapped = None
+		self.count = 0
+		self._reset()
+
+	def _check_writable(self):
+		if self.mapped is not None:
+			raise TypeError("a memory-mapped KDTree is read-only")
+
+	def __len__(self):
+		return self.count
+
+	def point(self, node):
+		"""Return the point stored at node as a tuple."""
+		k = self.k
+		return tuple(self.coords[node * k:(node + 1) * k])
+
+	def _search(self, point, k_nearest, max_dist2=math.inf):
+		"""Return up to k_nearest (squared distance, node) pairs closest to point, nearest first."""
+		if self.root == -1 or k_nearest <= 0:
+			return []
+		k = self.k
+		coords, ids, axes, left, right = self.coords, self.ids, self.axes, self.left, self.right
+
+		best = []  # max-heap of (-squared distance, node)
+		worst = max_dist2
+		stack = [(self.root, 0.0)]
+		while stack:
+			node, bound = stack.pop()
+			# skip the whole subtree when its splitting plane is farther than the current worst candidate
+			if bound > worst:
+				continue
+
+			base = node * k
+			dist2 = 0.0
+			for j in range(k):
+				diff = coords[base + j] - point[j]
+				dist2 += diff * diff
+			if dist2 <= worst and ids[node] >= 0:
+				if len(best) < k_nearest:
+					heapq.heappush(best, (-dist2, node))
+				elif dist2 < -best[0][0]:
+					heapq.heapreplace(best, (-dist2, node))
+				if len(best) == k_nearest:
+					worst = min(max_dist2, -best[0][0])
+
+			axis = axes[node]
+			diff = point[axis] - coords[base + axis]
+			if diff < 0:
+				near, far = left[node], right[node]
+			else:
+				near, far = right[node], left[node]
+			# push the near side last so it is visited first
+			if far != -1:
+				stack.append((far, diff * diff))
+			if near != -1:
+				stack.append((near, 0.0))
+
+		return sorted((-neg, node) for neg, node in best)
+
+	def nearest(self, point):
+		"""Return the point closest to point, or None if the tree is empty."""
+		found = self._search(point, 1)
+		return self.point(found[0][1]) if found else None
+
+	def knn(self, point, k):
+		"""Return the k points closest to point, nearest first."""
+		return [self.point(node) for _, node in self._search(point, k)]
+
+	def radius(self, point, r):
+		"""Return every point within distance r of point, nearest first."""
+		found = self._search(point, len(self), r * r)
+		return [self.point(node) for _, node in found]
+
+	def insert(self, point):
+		"""Add point to the tree and return its id (the next position after the input points)."""
+		self._check_writable()
+		if not self.k and not self.ids:
+			# KDTree([]) without k: the first point fixes the dimension
+			self.k = len(point)
+		if len(point) != self.k:
+			raise ValueError(f"expected a point with {self.k} coordinates, got {len(point)}")
+		k = self.k
+		coords, left, right = self.coords, self.left, self.right
+		point_id = self.next_id
+		self.next_id += 1
+		self.count += 1
+
+		slot = len(self.ids)
+		coords.extend(point)
+		self.ids.append(point_id)
+		left.append(-1)
+		right.append(-1)
+		self.sizes.append(1)
+		self.packed.append(1)
+		if self.root == -1:
+			self.axes.append(0)
+			self.root = slot
+			return point_id
+
+		path = []
+		node = self.root
+		while node != -1:
+			path.append(node)
+			self.sizes[node] += 1
+			self.packed[node] = 0
+			axis = self.axes[node]
+			branch = left if point[axis] < coords[node * k + axis] else right
+			parent, node = node, branch[node]
+		branch[parent] = slot
+		self.axes.append((self.axes[parent] + 1) % k)
+
+		if len(path) > math.log(self.sizes[self.root], 1 / self.alpha):
+			# scapegoat: the lowest ancestor with a child holding more than alpha of its slots
+			child = slot
+			for depth in range(len(path) - 1, -1, -1):
+				node = path[depth]
+				if self.sizes[child] > self.alpha * self.sizes[node]:
+					self._rebuild_subtree(path, depth)
+					break
+				child = node
+		return point_id
+
+	def delete(self, point):
+		"""Remove one occurrence of point. Returns False if it is not in the tree."""
+		self._check_writable()
+		if not self.k and not self.ids:
+			# KDTree([]) without k holds nothing yet, and only insert may fix the dimension
+			return False
+		if len(point) != self.k:
+			raise ValueError(f"expected a point with {self.k} coordinates, got {len(point)}")
+		k = self.k
+		coords, ids = self.coords, self.ids
+		stack = [self.root] if self.root != -1 else []
+		while stack:
+			node = stack.pop()
+			base = node * k
+			if ids[node] >= 0 and all(coords[base + j] == point[j] for j in range(k)):
+				break
+			# points equal to the split value can sit on either side
+			axis = self.axes[node]
+			if point[axis] <= coords[base + axis] and self.left[node] != -1:
+				stack.append(self.left[node])
+			if point[axis] >= coords[base + axis] and self.right[node] != -1:
+				stack.append(self.right[node])
+		else:
+			return False
+
+		# tombstone: the slot stays in the tree until the next rebuild
+		ids[node] = -1
+		self.count -= 1
+		if len(ids) - self.count > self.max_dead_ratio * len(ids):
+			self._rebuild()
+		return True
+
+	def _live_nodes(self, root):
+		"""Slots of the live (not deleted) nodes in root's subtree."""
+		ids, left, right = self.ids, self.left, self.right
+		live = []
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			if ids[node] >= 0:
+				live.append(node)
+			if left[node] != -1:
+				stack.append(left[node])
+			if right[node] != -1:
+				stack.append(right[node])
+		return live
+
+	def _rebuild_subtree(self, path, depth):
+		"""Rebuild path[depth]'s subtree as a packed block at the end of the arrays, dropping its tombstones."""
+		node = path[depth]
+		live = self._live_nodes(node)
+		points = [self.point(slot) for slot in live]
+		ids = [self.ids[slot] for slot in live]
+		removed = self.sizes[node] - len(live)
+		for slot in live:
+			# the old slots become garbage, reclaimed by the next full rebuild
+			self.ids[slot] = -1
+
+		new_root = self._append_block(points, ids, depth)
+		if depth == 0:
+			self.root = new_root
+		else:
+			parent = path[depth - 1]
+			branch = self.left if self.left[parent] == node else self.right
+			branch[parent] = new_root
+			for ancestor in path[:depth]:
+				self.sizes[ancestor] -= removed
+
+		if len(self.ids) - self.count > self.max_dead_ratio * len(self.ids):
+			self._rebuild()
+
+	def _rebuild(self):
+		"""Rebuild the whole tree from its live points, reclaiming every dead slot."""
+		live = [slot for slot in range(len(self.ids)) if self.ids[slot] >= 0]
+		points = [self.point(slot) for slot in live]
+		ids = [self.ids[slot] for slot in live]
+		self._reset()
+		self.root = self._append_block(points, ids, 0)
+
+	def knn_batch(self, queries, k, leaf_size=64):
+		"""
+		Answer k-NN for every row of an (m, k) query array in one call.
+
+		Returns (ids, distances), both of shape (m, k) and sorted nearest first per row; ids are
+		positions in the input points, padded with -1 / inf when the tree has fewer than k points.
+		"""
+		if np is None:
+			raise ImportError("KDTree.knn_batch requires numpy")
+		queries = np.asarray(queries, dtype=np.float64)
+		if queries.ndim != 2 or queries.shape[1] != self.k:
+			raise ValueError(f"expected an (m, {self.k}) array, got shape {queries.shape}")
+		m = len(queries)
+		best_d = np.full((m, k), np.inf)
+		best_n = np.full((m, k), -1, dtype=np.int64)
+		if m == 0 or k <= 0 or self.root == -1:
+			return best_n, best_d
+
+		slots = len(self.ids)
+		coords = np.frombuffer(self.coords, dtype=np.float64).reshape(slots, self.k)
+		ids = np.frombuffer(self.ids, dtype=np.int64)
+		dead = ids < 0
+		axes, left, right, sizes, packed = self.axes, self.left, self.right, self.sizes, self.packed
+		every = np.arange(m)
+
+		# 1) Walk every query down to a home subtree of at least max(leaf_size, k) slots at once;
+		#    its k-th nearest point bounds the search radius before any backtracking happens.
+		size = max(leaf_size, k)
+		axes_np = np.frombuffer(axes, dtype=np.int8)
+		left_np = np.frombuffer(left, dtype=np.int64)
+		right_np = np.frombuffer(right, dtype=np.int64)
+		sizes_np = np.frombuffer(sizes, dtype=np.int64)
+		home = np.full(m, self.root, dtype=np.int64)
+		while True:
+			axis = axes_np[home]
+			child = np.where(queries[every, axis] < coords[home, axis], left_np[home], right_np[home])
+			step = (child != -1) & (sizes_np[child] >= size)
+			if not step.any():
+				break
+			home = np.where(step, child, home)
+		# only packed subtrees are contiguous; the rest start from an unbounded search
+		home_size = np.where(np.frombuffer(packed, dtype=np.int8)[home] == 1, sizes_np[home], 0)
+		lo = home - home_size // 2
+		bound = np.full(m, np.inf)
+		width = home_size.max()
+		if width >= k:
+			# (rows, width, k) temporaries per chunk instead of for all m queries at once
+			for start in range(0, m, _HOME_CHUNK):
+				rows = slice(start, start + _HOME_CHUNK)
+				block = lo[rows, None] + np.arange(width)
+				inside = block < (lo[rows] + home_size[rows])[:, None]
+				block = np.where(inside, block, 0)
+				diff = queries[rows, None, :] - coords[block]
+				dist2 = np.where(inside & ~dead[block], np.einsum('ijk,ijk->ij', diff, diff), np.inf)
+				bound[rows] = np.partition(dist2, k - 1, axis=1)[:, k - 1]
+
+		def merge(active, nodes, dist2):
+			cand_d = np.concatenate((best_d[active], dist2), axis=1)
+			cand_n = np.concatenate((best_n[active], np.broadcast_to(nodes, dist2.shape)), axis=1)
+			rows = np.arange(len(active))[:, None]
+			part = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+			best_d[active] = cand_d[rows, part]
+			best_n[active] = cand_n[rows, part]
+
+		# 2) Walk the tree once for all queries together; a node is visited once for the whole
+		#    group of queries whose search ball still crosses it, and small packed subtrees are one block.
+		def visit(node, active):
+			if node == -1 or len(active) == 0:
+				return
+			q = queries[active]
+			size = sizes[node]
+			if size <= leaf_size and packed[node]:
+				lo = node - size // 2
+				diff = q[:, None, :] - coords[lo:lo + size]
+				dist2 = np.einsum('ijk,ijk->ij', diff, diff)
+				dist2[:, dead[lo:lo + size]] = np.inf
+				merge(active, np.arange(lo, lo + size), dist2)
+				return
+
+			axis = axes[node]
+			current = best_d[active]
+			if not dead[node]:
+				diff = q - coords[node]
+				dist2 = np.einsum('ij,ij->i', diff, diff)
+				# a single candidate only ever replaces the current worst slot
+				slot = current.argmax(axis=1)
+				rows = np.flatnonzero(dist2 < current[np.arange(len(active)), slot])
+				best_d[active[rows], slot[rows]] = dist2[rows]
+				best_n[active[rows], slot[rows]] = node
+				current[rows, slot[rows]] = dist2[rows]
+
+			plane = q[:, axis] - coords[node, axis]
+			reach = plane * plane <= np.minimum(bound[active], current.max(axis=1))
+			visit(left[node], active[(plane < 0) | reach])
+			visit(right[node], active[(plane >= 0) | reach])
+
+		visit(self.root, every)
+		# visit refers to itself; break the cycle so the buffer views above are released right away
+		del visit
+
+		order = np.argsort(best_d, axis=1)
+		best_d = np.take_along_axis(best_d, order, axis=1)
+		best_n = np.take_along_axis(best_n, order, axis=1)
+		return np.where(np.isfinite(best_d), ids[best_n], -1), np.sqrt(best_d)
+
+if __name__ == "__main__":
+	points = [
+		(0, 0),
+		(1, 0),
+		(2, 2)
+	]
+
+	pprint(kdtree(points, 0, 2))
+
+	tree = KDTree(points)
+	print(tree.nearest((1.8, 1.5)))
+	print(tree.knn((0, 0), 2))
+	print(tree.radius((0, 0), 1))
@@ -0,0 +1,74 @@
+"""
+Flat arrays saved back to back after a fixed header, and mapped back in with mmap
+
+Shared by KDTree.save / load and FrozenTrie.save / load. The arrays are written
+in memory order, so the formats are little-endian with the standard struct item
+sizes and both sides refuse to run on a machine where native arrays differ.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+
+def check_layout(arrays, kind):
+    """Raise ValueError unless native arrays of every (name, typecode) match the file layout."""
+    if sys.byteorder != "little" or any(array(code).itemsize != struct.calcsize("<" + code) for _, code in arrays):
+        raise ValueError(f"the {kind} format needs a little-endian machine with standard item sizes")
+
+
+def save_arrays(path, header, owner, arrays, kind):
+    """Write the packed header, then the array attribute of owner named by each (name, typecode)."""
+    check_layout(arrays, kind)
+    with open(path, "wb") as f:
+        f.write(header)
+        for name, _ in arrays:
+            f.write(getattr(owner, name))
+
+
+def load_arrays(path, header, magic, version, arrays, lengths, kind):
+    """
+    Map path read-only and return (mapped, fields, views).
+
+    header is the struct.Struct of the file header and starts with the magic and
+    version fields. lengths(fields) gives the item count of every array from the
+    unpacked header, and the file must be exactly that long, so a truncated file
+    is rejected before any slice reaches memoryview.cast(). views maps each array
+    name to a memoryview into mapped.
+    """
+    check_layout(arrays, kind)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if len(mapped) < header.size:
+            raise ValueError(f"{path} is not a {kind}")
+        fields = header.unpack_from(mapped)
+        if fields[0] != magic:
+            raise ValueError(f"{path} is not a {kind}")
+        if fields[1] != version:
+            raise ValueError(f"unsupported {kind} version {fields[1]}")
+
+        counts = lengths(fields)
+        sizes = [counts[name] * struct.calcsize(code) for name, code in arrays]
+        if header.size + sum(sizes) != len(mapped):
+            raise ValueError(f"{path} is truncated or has trailing data")
+        offset = header.size
+        views = {}
+        buffer = memoryview(mapped)
+        for (name, code), nbytes in zip(arrays, sizes):
+            views[name] = buffer[offset:offset + nbytes].cast(code)
+            offset += nbytes
+    except Exception:
+        # the views must go before the mapping can close
+        views = buffer = None
+        mapped.close()
+        raise
+    return mapped, fields, views
+
+
+def release_arrays(owner, arrays):
+    """Release the views load_arrays() returned, once set on owner, and close its mapping."""
+    for name, _ in arrays:
+        getattr(owner, name).release()
+    owner.mapped.close()
@@ -1,18 +1,48 @@
 
 
-import math
-from turtle import left
+from array import array
 
 
 class Heap:
   
-  def __init__(self) -> None:
+  def __init__(self, typecode=None) -> None:
+    """
+    typecode 를 주면 (예: 'd', 'q') 값을 Python 객체 대신 array 모듈의 typed array 에 저장한다.
+    숫자 키만 담는 큰 힙에서 원소당 메모리가 크게 줄어든다. 비어있는 칸은 None 대신 0 으로 채워진다.
+    """
     self.size = 100
+    self.typecode = typecode
+    self.empty = None if typecode is None else 0
     self.last_index = 0
-    self.array = [None] * self.size
+    self.array = self._blank(self.size)
+    
+  def _blank(self, count: int):
+    """비어있는 칸 count 개짜리 저장소를 만든다"""
+    if self.typecode is None:
+      return [None] * count
+    return array(self.typecode, [0]) * count
     
   def _grow(self):
-    self.array += [None] * self.size
+    # 용량을 두 배로 늘려서 n 번 삽입할 때 복사 비용이 모두 합쳐 O(n) 이 되도록 한다
+    self.array += self._blank(len(self.array))
+  
+  @classmethod
+  def from_iterable(cls, values, typecode=None) -> "Heap":
+    """값들을 한 번에 담은 뒤 아래에서부터 heapify 해서 O(n) 에 힙을 만든다"""
+    heap = cls(typecode)
+    heap.array = heap._blank(1)
+    heap.array += list(values) if typecode is None else array(typecode, values)
+    heap.last_index = len(heap.array) - 1
+    heap._heapify()
+    return heap
+  
+  def _heapify(self):
+    """자식이 있는 마지막 노드부터 루트까지 거꾸로 내려가며 힙 속성을 복원 (O(n))"""
+    for index in range(self._parent(self.last_index), 0, -1):
+      self._heapify_down(index)
+  
+  def _parent(self, index: int) -> int:
+    return index >> 1
   
   def insert(self, value: int):
     if self.last_index == len(self.array) - 1:
@@ -20,21 +50,23 @@ class Heap:
     
     self.last_index += 1
     self.array[self.last_index] = value
-    
-    curr = self.last_index
-    parent = math.floor(curr / 2)
+    self._sift_up(self.last_index)
+  
+  def _sift_up(self, curr: int):
+    """위쪽으로 힙 속성을 복원하는 메서드"""
+    parent = curr >> 1
     
     while parent >= 1 and self.array[parent] < self.array[curr]:
       tmp = self.array[parent]
       self.array[parent] = self.array[curr]
       self.array[curr] = tmp
       curr = parent
-      parent = math.floor(curr / 2)
+      parent = curr >> 1
       
   def _find_larger_child_index(self, index: int) -> int:
     """주어진 노드의 자식 중 더 큰 값을 가진 자식의 인덱스를 반환"""
-    left_child = index * 2
-    right_child = index * 2 + 1
+    left_child = index << 1
+    right_child = left_child | 1
     largest = index
     
     # 왼쪽 자식이 존재하고 현재 노드보다 크면
@@ -68,13 +100,13 @@ class Heap:
     
     # 삭제할 노드가 마지막 노드인 경우
     if index == self.last_index:
-      self.array[self.last_index] = None
+      self.array[self.last_index] = self.empty
       self.last_index -= 1
       return True
     
     # 마지막 노드의 값을 삭제할 위치로 이동
     self.array[index] = self.array[self.last_index]
-    self.array[self.last_index] = None
+    self.array[self.last_index] = self.empty
     self.last_index -= 1
     
     # 힙이 비어있으면 종료
@@ -82,14 +114,10 @@ class Heap:
       return True
     
     # 부모와 비교해서 위로 올라가야 하는지 확인
-    parent = math.floor(index / 2)
+    parent = self._parent(index)
     if parent >= 1 and self.array[index] > self.array[parent]:
       # 위로 올라가는 heapify (insert와 동일한 로직)
-      curr = index
-      while parent >= 1 and self.array[parent] < self.array[curr]:
-        self.array[parent], self.array[curr] = self.array[curr], self.array[parent]
-        curr = parent
-        parent = math.floor(curr / 2)
+      self._sift_up(index)
     else:
       # 아래로 내려가는 heapify
       self._heapify_down(index)
@@ -110,4 +138,432 @@ class Heap:
     if self.last_index == 0:
       return None
     return self.array[1]
-    
\ No newline at end of file
+  
+  def push_many(self, values):
+    """
+    값 여러 개를 한 번에 삽입
+    
+    배치가 힙 크기에 비해 크면 (b log(n + b) > 2(n + b)) 뒤에 이어 붙인 다음 전체를 O(n + b) 에 heapify 하고,
+    작으면 하나씩 insert 한다.
+    """
+    batch = list(values) if self.typecode is None else array(self.typecode, values)
+    count = len(batch)
+    total = self.last_index + count
+    if count * total.bit_length() <= 2 * total:
+      for value in batch:
+        self.insert(value)
+      return
+    
+    while len(self.array) <= total:
+      self._grow()
+    self.array[self.last_index + 1:total + 1] = batch
+    self.last_index = total
+    self._heapify()
+  
+  def pop_n(self, k: int) -> list:
+    """최대값부터 k 개를 삭제하고 큰 순서대로 반환 (힙에 k 개보다 적으면 전부)"""
+    result = []
+    for _ in range(min(k, self.last_index)):
+      result.append(self.array[1])
+      self.array[1] = self.array[self.last_index]
+      self.array[self.last_index] = self.empty
+      self.last_index -= 1
+      self._heapify_down(1)
+    return result
+  
+  def pushpop(self, value):
+    """value 를 넣은 다음 최대값을 꺼내서 반환. insert 후 delete_root 보다 빠르다"""
+    if self.last_index == 0 or value >= self.array[1]:
+      # 넣자마자 다시 꺼낼 값이면 힙을 건드리지 않는다
+      return value
+    root_value = self.array[1]
+    self.array[1] = value
+    self._heapify_down(1)
+    return root_value
+  
+  def replace(self, value):
+    """최대값을 꺼낸 다음 value 를 넣고, 꺼낸 값을 반환 (빈 힙이면 넣기만 하고 None)"""
+    if self.last_index == 0:
+      self.insert(value)
+      return None
+    root_value = self.array[1]
+    self.array[1] = value
+    self._heapify_down(1)
+    return root_value
+
+
+class DaryHeap(Heap):
+  """
+  자식이 arity 개인 d-ary 최대 힙 (Heap 과 같은 API)
+  
+  인덱스 1 이 루트이고 노드 i 의 자식은 arity * (i - 1) + 2 부터 arity 개다 (arity=2 이면 Heap 과 같은 배치).
+  arity 가 클수록 트리가 낮아져 insert 는 적게 올라가고, 한 노드의 자식들이 배열에서 붙어 있어 캐시에 유리하다.
+  대신 delete 는 단계마다 자식 arity 개를 비교해야 한다.
+  """
+  
+  def __init__(self, arity: int = 4, typecode=None) -> None:
+    if arity < 2:
+      raise ValueError("arity must be at least 2")
+    self.arity = arity
+    super().__init__(typecode)
+  
+  @classmethod
+  def from_iterable(cls, values, typecode=None, arity: int = 4) -> "DaryHeap":
+    """값들을 한 번에 담은 뒤 아래에서부터 heapify 해서 O(n) 에 힙을 만든다"""
+    heap = cls(arity, typecode)
+    heap.push_many(values)
+    return heap
+  
+  def _parent(self, index: int) -> int:
+    return (index - 2) // self.arity + 1
+  
+  def _sift_up(self, curr: int):
+    array, arity = self.array, self.arity
+    value = array[curr]
+    parent = (curr - 2) // arity + 1
+    # 교환 대신 부모를 한 칸씩 내리고 마지막에 한 번만 쓴다
+    while parent >= 1 and array[parent] < value:
+      array[curr] = array[parent]
+      curr = parent
+      parent = (curr - 2) // arity + 1
+    array[curr] = value
+  
+  def _heapify_down(self, index: int):
+    array, arity, last = self.array, self.arity, self.last_index
+    value = array[index]
+    while True:
+      first = arity * (index - 1) + 2
+      if first > last:
+        break
+      # 자식 arity 개 중 가장 큰 것을 고른다 (max(key=) 는 원소마다 key 호출 비용이 들어 단순 루프보다 느리다)
+      largest, largest_value = first, array[first]
+      for child in range(first + 1, min(first + arity, last + 1)):
+        child_value = array[child]
+        if child_value > largest_value:
+          largest, largest_value = child, child_value
+      if not largest_value > value:
+        break
+      array[index] = array[largest]
+      index = largest
+    array[index] = value
+
+
+class IndexedHeap:
+  """
+  handle 로 원소를 가리킬 수 있는 최대 힙 (addressable priority queue)
+
+  push 가 돌려준 handle 로 우선순위 변경과 삭제를 O(log n) 에 할 수 있다.
+  sift 할 때마다 handle -> 배열 인덱스 위치 표(position)를 함께 갱신한다.
+  """
+  
+  def __init__(self) -> None:
+    self.size = 100
+    self.last_index = 0
+    self.array = [None] * self.size    # 우선순위
+    self.handles = [None] * self.size  # 같은 칸에 있는 원소의 handle
+    self.position = {}                 # handle -> 배열 인덱스
+    self.items = {}                    # handle -> 원소
+    self.next_handle = 0
+    
+  def _grow(self):
+    self.array += [None] * len(self.array)
+    self.handles += [None] * len(self.handles)
+  
+  def __len__(self) -> int:
+    return self.last_index
+  
+  def __contains__(self, handle) -> bool:
+    return handle in self.position
+  
+  def _sift_up(self, index: int):
+    """index 의 원소를 부모보다 작아질 때까지 위로 올린다 (빈 칸을 옮기는 방식이라 교환보다 쓰기가 적다)"""
+    array, handles, position = self.array, self.handles, self.position
+    priority = array[index]
+    handle = handles[index]
+    parent = index >> 1
+    while parent >= 1 and array[parent] < priority:
+      array[index] = array[parent]
+      handles[index] = handles[parent]
+      position[handles[index]] = index
+      index = parent
+      parent = index >> 1
+    array[index] = priority
+    handles[index] = handle
+    position[handle] = index
+  
+  def _sift_down(self, index: int):
+    """index 의 원소를 두 자식보다 커질 때까지 아래로 내린다"""
+    array, handles, position = self.array, self.handles, self.position
+    priority = array[index]
+    handle = handles[index]
+    while True:
+      child = index << 1
+      if child > self.last_index:
+        break
+      # 더 큰 자식을 고른다
+      if child < self.last_index and array[child | 1] > array[child]:
+        child |= 1
+      if not array[child] > priority:
+        break
+      array[index] = array[child]
+      handles[index] = handles[child]
+      position[handles[index]] = index
+      index = child
+    array[index] = priority
+    handles[index] = handle
+    position[handle] = index
+  
+  def push(self, item, priority) -> int:
+    """원소를 넣고 나중에 update_priority / remove 에 쓸 handle 을 반환"""
+    if self.last_index == len(self.array) - 1:
+      self._grow()
+    
+    handle = self.next_handle
+    self.next_handle += 1
+    self.items[handle] = item
+    
+    self.last_index += 1
+    self.array[self.last_index] = priority
+    self.handles[self.last_index] = handle
+    self._sift_up(self.last_index)
+    return handle
+  
+  def peek(self):
+    """우선순위가 가장 높은 (원소, 우선순위) 를 반환 (삭제하지 않음)"""
+    if self.last_index == 0:
+      return None
+    return self.items[self.handles[1]], self.array[1]
+  
+  def pop(self):
+    """우선순위가 가장 높은 (원소, 우선순위) 를 삭제하고 반환"""
+    if self.last_index == 0:
+      return None
+    top = self.peek()
+    self.remove(self.handles[1])
+    return top
+  
+  def priority(self, handle):
+    """handle 의 현재 우선순위를 반환. 없는 handle 이면 None"""
+    if handle not in self.position:
+      return None
+    return self.array[self.position[handle]]
+  
+  def update_priority(self, handle, priority) -> bool:
+    """handle 의 우선순위를 바꾸고 힙 속성을 복원. 없는 handle 이면 False"""
+    index = self.position.get(handle)
+    if index is None:
+      return False
+    
+    old = self.array[index]
+    self.array[index] = priority
+    if priority > old:
+      self._sift_up(index)
+    elif priority < old:
+      self._sift_down(index)
+    return True
+  
+  def remove(self, handle) -> bool:
+    """handle 의 원소를 삭제. 없는 handle 이면 False"""
+    index = self.position.pop(handle, None)
+    if index is None:
+      return False
+    del self.items[handle]
+    
+    last = self.last_index
+    self.last_index -= 1
+    if index != last:
+      # 마지막 원소를 빈 자리로 옮긴 뒤 위나 아래로 제자리를 찾아간다
+      self.array[index] = self.array[last]
+      self.handles[index] = self.handles[last]
+      parent = index >> 1
+      if parent >= 1 and self.array[index] > self.array[parent]:
+        self._sift_up(index)
+      else:
+        self._sift_down(index)
+    self.array[last] = None
+    self.handles[last] = None
+    return True
+
+
+def _ascending(key_a, seq_a, key_b, seq_b) -> bool:
+  """a 가 b 보다 먼저 나와야 하면 True (작은 키 우선, 같으면 먼저 넣은 것 우선)"""
+  return key_a < key_b or (key_a == key_b and seq_a < seq_b)
+
+
+def _descending(key_a, seq_a, key_b, seq_b) -> bool:
+  """a 가 b 보다 먼저 나와야 하면 True (큰 키 우선, 같으면 먼저 넣은 것 우선)"""
+  return key_a > key_b or (key_a == key_b and seq_a < seq_b)
+
+
+class KeyHeap:
+  """
+  key= / reverse= 로 순서를 정하는 안정(stable) 힙
+
+  sorted() 와 같은 규칙으로 reverse=False 이면 가장 작은 키가, reverse=True 이면 가장 큰 키가 먼저 나온다.
+  key 함수는 insert 할 때 한 번만 호출해서 values 와 나란한 keys 배열에 저장하고,
+  키가 같은 원소는 삽입 순번(seqs)으로 비교해서 먼저 넣은 것이 먼저 나온다.
+  newest_first=True 이면 순번을 거꾸로 매겨서 키가 같을 때 나중에 넣은 것이 먼저 나온다.
+  """
+  
+  def __init__(self, key=None, reverse: bool = False, newest_first: bool = False) -> None:
+    self.size = 100
+    self.last_index = 0
+    self.key = key
+    self.reverse = reverse
+    self.before = _descending if reverse else _ascending
+    self.values = [None] * self.size
+    self.keys = [None] * self.size
+    self.seqs = [0] * self.size
+    self.next_seq = 0
+    self.seq_step = -1 if newest_first else 1
+  
+  @classmethod
+  def from_iterable(cls, values, key=None, reverse: bool = False, newest_first: bool = False) -> "KeyHeap":
+    """값들을 한 번에 담은 뒤 아래에서부터 heapify 해서 O(n) 에 힙을 만든다"""
+    heap = cls(key, reverse, newest_first)
+    values = list(values)
+    n = len(values)
+    step = heap.seq_step
+    heap.values = [None] + values
+    heap.keys = [None] + (values if key is None else [key(value) for value in values])
+    heap.seqs = [0] + list(range(0, n * step, step))
+    heap.next_seq = n * step
+    heap.last_index = n
+    heap._heapify()
+    return heap
+  
+  def _heapify(self):
+    """자식이 있는 마지막 노드부터 루트까지 거꾸로 내려가며 힙 속성을 복원 (O(n))"""
+    for index in range(self.last_index >> 1, 0, -1):
+      self._sift_down(index)
+  
+  def __len__(self) -> int:
+    return self.last_index
+  
+  def _grow(self):
+    count = len(self.values)
+    self.values += [None] * count
+    self.keys += [None] * count
+    self.seqs += [0] * count
+  
+  def _sift_up(self, index: int):
+    values, keys, seqs, before = self.values, self.keys, self.seqs, self.before
+    value, key, seq = values[index], keys[index], seqs[index]
+    parent = index >> 1
+    while parent >= 1 and before(key, seq, keys[parent], seqs[parent]):
+      values[index], keys[index], seqs[index] = values[parent], keys[parent], seqs[parent]
+      index = parent
+      parent = index >> 1
+    values[index], keys[index], seqs[index] = value, key, seq
+  
+  def _sift_down(self, index: int):
+    values, keys, seqs, before = self.values, self.keys, self.seqs, self.before
+    value, key, seq = values[index], keys[index], seqs[index]
+    last = self.last_index
+    while True:
+      child = index << 1
+      if child > last:
+        break
+      # 먼저 나와야 하는 자식을 고른다
+      right = child | 1
+      if right <= last and before(keys[right], seqs[right], keys[child], seqs[child]):
+        child = right
+      if not before(keys[child], seqs[child], key, seq):
+        break
+      values[index], keys[index], seqs[index] = values[child], keys[child], seqs[child]
+      index = child
+    values[index], keys[index], seqs[index] = value, key, seq
+  
+  def insert(self, value):
+    if self.last_index == len(self.values) - 1:
+      self._grow()
+    
+    self.last_index += 1
+    index = self.last_index
+    self.values[index] = value
+    self.keys[index] = value if self.key is None else self.key(value)
+    self.seqs[index] = self.next_seq
+    self.next_seq += self.seq_step
+    self._sift_up(index)
+  
+  def peek(self):
+    """가장 먼저 나올 값을 반환 (삭제하지 않음)"""
+    if self.last_index == 0:
+      return None
+    return self.values[1]
+  
+  def delete_root(self):
+    """가장 먼저 나올 값을 삭제하고 반환"""
+    if self.last_index == 0:
+      return None
+    
+    root_value = self.values[1]
+    last = self.last_index
+    self.values[1], self.keys[1], self.seqs[1] = self.values[last], self.keys[last], self.seqs[last]
+    self.values[last] = self.keys[last] = None
+    self.last_index -= 1
+    if self.last_index > 1:
+      self._sift_down(1)
+    return root_value
+  
+  def pushpop(self, value):
+    """value 를 넣은 다음 가장 먼저 나올 값을 꺼내서 반환. insert 후 delete_root 보다 빠르다"""
+    key = value if self.key is None else self.key(value)
+    seq = self.next_seq
+    self.next_seq += self.seq_step
+    if self.last_index == 0 or not self.before(self.keys[1], self.seqs[1], key, seq):
+      # 넣자마자 다시 꺼낼 값이면 힙을 건드리지 않는다
+      return value
+    root_value = self.values[1]
+    self.values[1], self.keys[1], self.seqs[1] = value, key, seq
+    self._sift_down(1)
+    return root_value
+  
+  def pushpop_many(self, values):
+    """
+    values 를 차례로 pushpop 하고 꺼낸 값은 버린다. 힙 크기는 그대로 유지된다.
+    
+    루트보다 뒤에 나올 값만 루트를 밀어내므로 대부분의 값은 루트와 한 번 비교하고 끝난다.
+    """
+    if self.last_index == 0:
+      return
+    heap_values, keys, seqs = self.values, self.keys, self.seqs
+    key_fn, reverse = self.key, self.reverse
+    seq, step = self.next_seq, self.seq_step
+    # 새 값은 순번이 가장 뒤이므로 키가 같을 때는 먼저 넣은 것이 먼저 나오는 경우에만 루트가 밀려난다
+    oldest_first = step > 0
+    for value in values:
+      key = value if key_fn is None else key_fn(value)
+      root_key = keys[1]
+      if (root_key > key if reverse else root_key < key) or (oldest_first and root_key == key):
+        heap_values[1], keys[1], seqs[1] = value, key, seq
+        self._sift_down(1)
+      seq += step
+    self.next_seq = seq
+
+
+def top_k(values, k: int, key=None) -> list:
+  """
+  스트림에서 key 기준으로 가장 큰 k 개를 큰 순서대로 반환 (키가 같으면 먼저 나온 것 우선)
+  
+  크기 k 인 최소 힙만 유지하므로 O(n log k) 시간, O(k) 메모리로 동작한다.
+  대부분의 원소는 힙의 최소값과 한 번 비교하고 바로 버려진다.
+  """
+  if k <= 0:
+    return []
+  iterator = iter(values)
+  first = []
+  for value in iterator:
+    first.append(value)
+    if len(first) == k:
+      break
+  
+  # 가장 작은 값이 루트인 힙. 키가 같으면 나중에 나온 원소가 먼저 밀려난다
+  heap = KeyHeap.from_iterable(first, key=key, newest_first=True)
+  # 현재 k 개 중 가장 작은 값보다 커야만 힙에 남는다
+  heap.pushpop_many(iterator)
+  
+  # 작은 순서 (키가 같으면 나중에 나온 것 먼저) 로 꺼낸 것을 뒤집는다
+  kept = [heap.delete_root() for _ in range(len(heap))]
+  kept.reverse()
+  return kept
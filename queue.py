@@ -1,28 +1,450 @@
 
 
+import asyncio
+from multiprocessing import shared_memory
+import operator
+import struct
+import threading
+import time
+
+
+MIN_CAPACITY = 10
+
+
+# SharedMemoryQueue block: the read and write counters on separate 64-byte cache lines,
+# then capacity, record size and record format, then the ring of records.
+_HEAD = 0  # index into the block's first 128 bytes viewed as 8-byte words
+_TAIL = 8
+_SHARED_LAYOUT = struct.Struct("<QQ32s")
+_SHARED_LAYOUT_OFFSET = 128
+_SHARED_HEADER = 192
+
+
+class Empty(Exception):
+  """Raised by get() when no element arrived before the timeout."""
+
+
+class Full(Exception):
+  """Raised by put() when no slot freed up before the timeout."""
+
+
 class Queue():
+  """
+  FIFO queue on a circular buffer.
+
+  front is the slot of the oldest element and back the slot the next
+  enqueue writes to; both wrap around the end of arr, so dequeued slots are
+  reused. arr doubles when full and halves when no more than a quarter
+  full, so memory follows the queue depth, not the total traffic.
+  """
   
   def __init__(self) -> None:
-    self.arr = [None] * 10
+    self.arr = [None] * MIN_CAPACITY
     self.front = 0
     self.back = 0
+    self.size = 0
+  
+  def __len__(self) -> int:
+    return self.size
   
   def dequeue(self):
     ele = None
-    if self.back > self.front: 
+    if self.size:
       ele = self.arr[self.front]
+      self.arr[self.front] = None
       self.front += 1
+      if self.front == len(self.arr):
+        self.front = 0
+      self.size -= 1
+      if self.size <= len(self.arr) // 4 and len(self.arr) > MIN_CAPACITY:
+        self._resize(max(len(self.arr) // 2, MIN_CAPACITY))
     
     return ele
   
   
   def enqueue(self, ele):
-    if self.back >= len(self.arr):
-      self.arr += ([None] * len(self.arr))
+    if self.size == len(self.arr):
+      self._resize(len(self.arr) * 2)
     
     self.arr[self.back] = ele
     self.back += 1
+    if self.back == len(self.arr):
+      self.back = 0
+    self.size += 1
+    return None
+  
+  def enqueue_many(self, eles):
+    """Enqueue every element of an iterable, copying them in with at most two slice assignments."""
+    eles = eles if isinstance(eles, list) else list(eles)
+    count = len(eles)
+    if self.size + count > len(self.arr):
+      capacity = len(self.arr)
+      while capacity < self.size + count:
+        capacity *= 2
+      self._resize(capacity)
+    
+    capacity = len(self.arr)
+    first = min(count, capacity - self.back)
+    if first == count:
+      self.arr[self.back:self.back + count] = eles
+    else:
+      # the run wraps: fill up to the end of arr, then continue from slot 0
+      self.arr[self.back:] = eles[:first]
+      self.arr[:count - first] = eles[first:]
+    self.back = (self.back + count) % capacity
+    self.size += count
+    return None
+  
+  def dequeue_many(self, n):
+    """Dequeue up to n elements, oldest first, as a list; an empty list if the queue is empty."""
+    count = min(n, self.size)
+    if count <= 0:
+      return []
+    capacity = len(self.arr)
+    end = self.front + count
+    if end <= capacity:
+      eles = self.arr[self.front:end]
+      self.arr[self.front:end] = [None] * count
+    else:
+      end -= capacity
+      eles = self.arr[self.front:] + self.arr[:end]
+      self.arr[self.front:] = [None] * (capacity - self.front)
+      self.arr[:end] = [None] * end
+    self.front = end % capacity
+    self.size -= count
+    
+    while self.size <= capacity // 4 and capacity > MIN_CAPACITY:
+      capacity = max(capacity // 2, MIN_CAPACITY)
+    if capacity < len(self.arr):
+      self._resize(capacity)
+    return eles
+  
+  def _resize(self, capacity):
+    """Move the elements, oldest first, to the start of a new arr of the given capacity."""
+    end = self.front + self.size
+    if end <= len(self.arr):
+      items = self.arr[self.front:end]
+    else:
+      items = self.arr[self.front:] + self.arr[:end - len(self.arr)]
+    self.arr = items + [None] * (capacity - self.size)
+    self.front = 0
+    self.back = self.size
+
+
+class Deque(Queue):
+  """
+  Double-ended queue on the same growable circular buffer as Queue.
+
+  push_front steps front back by one slot and pop_back steps back back by
+  one, wrapping the same way enqueue and dequeue do; deque[i] maps i onto
+  the buffer in O(1). Popping an empty deque returns None.
+  """
+  
+  def push_back(self, ele):
+    self.enqueue(ele)
+  
+  def pop_front(self):
+    return self.dequeue()
+  
+  def push_front(self, ele):
+    if self.size == len(self.arr):
+      self._resize(len(self.arr) * 2)
+    
+    self.front -= 1
+    if self.front < 0:
+      self.front = len(self.arr) - 1
+    self.arr[self.front] = ele
+    self.size += 1
     return None
+  
+  def pop_back(self):
+    ele = None
+    if self.size:
+      self.back -= 1
+      if self.back < 0:
+        self.back = len(self.arr) - 1
+      ele = self.arr[self.back]
+      self.arr[self.back] = None
+      self.size -= 1
+      if self.size <= len(self.arr) // 4 and len(self.arr) > MIN_CAPACITY:
+        self._resize(max(len(self.arr) // 2, MIN_CAPACITY))
+    
+    return ele
+  
+  def __getitem__(self, index):
+    if index < 0:
+      index += self.size
+    if not 0 <= index < self.size:
+      raise IndexError("deque index out of range")
+    index += self.front
+    if index >= len(self.arr):
+      index -= len(self.arr)
+    return self.arr[index]
+
+
+def _sliding_window(values, width, keeps):
+  # window holds (index, value) pairs whose values run from the window's extreme at
+  # the front to the newest at the back; keeps(older, newer) says whether an older
+  # value can still be an extreme once newer has arrived. Every value is pushed and
+  # popped at most once, so the whole stream costs O(n).
+  window = Deque()
+  for index, value in enumerate(values):
+    while window and not keeps(window[-1][1], value):
+      window.pop_back()
+    window.push_back((index, value))
+    if window[0][0] <= index - width:
+      window.pop_front()
+    if index >= width - 1:
+      yield window[0][1]
+
+
+def sliding_window_max(values, width):
+  """Yield the maximum of each window of width consecutive values, as the stream arrives."""
+  if width <= 0:
+    raise ValueError("width must be positive")
+  return _sliding_window(values, width, operator.gt)
+
+
+def sliding_window_min(values, width):
+  """Yield the minimum of each window of width consecutive values, as the stream arrives."""
+  if width <= 0:
+    raise ValueError("width must be positive")
+  return _sliding_window(values, width, operator.lt)
+
+
+class BlockingQueue():
+  """
+  Thread-safe bounded queue on the same circular buffer.
+
+  put() waits while maxsize elements are queued and get() waits while the
+  queue is empty, each on its own condition variable over one lock, so
+  producers get backpressure and consumers sleep instead of polling.
+  timeout=None waits forever and timeout=0 does not wait; Full or Empty
+  is raised when the wait runs out. maxsize <= 0 means unbounded.
+  """
+  
+  def __init__(self, maxsize: int = 0) -> None:
+    self.maxsize = maxsize
+    self.items = Queue()
+    lock = threading.Lock()
+    self.not_empty = threading.Condition(lock)
+    self.not_full = threading.Condition(lock)
+  
+  def __len__(self) -> int:
+    return len(self.items)
+  
+  def _has_room(self) -> bool:
+    return self.maxsize <= 0 or len(self.items) < self.maxsize
+  
+  def put(self, ele, timeout=None):
+    with self.not_full:
+      if not self.not_full.wait_for(self._has_room, timeout):
+        raise Full
+      self.items.enqueue(ele)
+      self.not_empty.notify()
+  
+  def get(self, timeout=None):
+    with self.not_empty:
+      if not self.not_empty.wait_for(self.items.__len__, timeout):
+        raise Empty
+      ele = self.items.dequeue()
+      self.not_full.notify()
+      return ele
+
+
+class AsyncQueue():
+  """
+  BlockingQueue for asyncio: put() and get() are coroutines that suspend
+  the calling task instead of blocking the thread. Not thread-safe; use it
+  from one event loop.
+  """
+  
+  def __init__(self, maxsize: int = 0) -> None:
+    self.maxsize = maxsize
+    self.items = Queue()
+    lock = asyncio.Lock()
+    self.not_empty = asyncio.Condition(lock)
+    self.not_full = asyncio.Condition(lock)
+  
+  def __len__(self) -> int:
+    return len(self.items)
+  
+  def _has_room(self) -> bool:
+    return self.maxsize <= 0 or len(self.items) < self.maxsize
+  
+  async def put(self, ele, timeout=None):
+    async with self.not_full:
+      if not self._has_room():
+        try:
+          await asyncio.wait_for(self.not_full.wait_for(self._has_room), timeout)
+        except TimeoutError:
+          raise Full from None
+      self.items.enqueue(ele)
+      self.not_empty.notify()
+  
+  async def get(self, timeout=None):
+    async with self.not_empty:
+      if not self.items.__len__():
+        try:
+          await asyncio.wait_for(self.not_empty.wait_for(self.items.__len__), timeout)
+        except TimeoutError:
+          raise Empty from None
+      ele = self.items.dequeue()
+      self.not_full.notify()
+      return ele
+
+
+class SharedMemoryQueue():
+  """
+  Single-producer, single-consumer queue of fixed-size binary records in
+  a multiprocessing.shared_memory block, for passing records between two
+  processes without pickling or a manager process.
+
+  Each record is packed with the struct format given at creation. head
+  and tail count the records read and written so far: only the consumer
+  stores head and only the producer stores tail, each as one aligned
+  8-byte write, and a record is written before tail is advanced past it
+  (and read before head is). The counters are only atomic-ish: Python
+  has no memory barriers, so this relies on the hardware keeping stores
+  in order, as x86-64 does. On weakly ordered CPUs such as ARM the
+  consumer can see the new tail before the record's bytes, or the
+  producer can reuse a slot before it has been read, and records may
+  arrive torn. Exactly one process may put and one may get.
+
+  The creating process owns the block and should unlink() it when done.
+  Pass the queue to a multiprocessing.Process, or call attach(name), to
+  open the same block in another process.
+  """
+  
+  def __init__(self, record_format: str, capacity: int) -> None:
+    record = struct.Struct(record_format)
+    if capacity <= 0:
+      raise ValueError("capacity must be positive")
+    if len(record_format.encode()) > 32:
+      raise ValueError("record format must fit in 32 bytes")
+    shm = shared_memory.SharedMemory(create=True, size=_SHARED_HEADER + capacity * record.size)
+    _SHARED_LAYOUT.pack_into(shm.buf, _SHARED_LAYOUT_OFFSET, capacity, record.size, record_format.encode())
+    self._open(shm, record, capacity)
+  
+  @classmethod
+  def attach(cls, name: str) -> 'SharedMemoryQueue':
+    """Open a queue created in another process by its shared memory name."""
+    shm = shared_memory.SharedMemory(name=name, track=False)
+    capacity, _, record_format = _SHARED_LAYOUT.unpack_from(shm.buf, _SHARED_LAYOUT_OFFSET)
+    queue = cls.__new__(cls)
+    queue._open(shm, struct.Struct(record_format.rstrip(b"\0").decode()), capacity)
+    return queue
+  
+  def _open(self, shm, record, capacity):
+    self.shm = shm
+    self.name = shm.name
+    self.record = record
+    self.capacity = capacity
+    self.buf = shm.buf
+    self.counters = shm.buf[:_SHARED_LAYOUT_OFFSET].cast("Q")
+  
+  def __reduce__(self):
+    return (SharedMemoryQueue.attach, (self.name,))
+  
+  def __len__(self) -> int:
+    return self.counters[_TAIL] - self.counters[_HEAD]
+  
+  def try_put(self, values) -> bool:
+    """Write one record from a tuple of field values; False if the queue is full."""
+    counters = self.counters
+    tail = counters[_TAIL]
+    if tail - counters[_HEAD] == self.capacity:
+      return False
+    self.record.pack_into(self.buf, _SHARED_HEADER + (tail % self.capacity) * self.record.size, *values)
+    counters[_TAIL] = tail + 1
+    return True
+  
+  def try_get(self):
+    """Read one record as a tuple; None if the queue is empty."""
+    counters = self.counters
+    head = counters[_HEAD]
+    if head == counters[_TAIL]:
+      return None
+    values = self.record.unpack_from(self.buf, _SHARED_HEADER + (head % self.capacity) * self.record.size)
+    counters[_HEAD] = head + 1
+    return values
+  
+  def put_many(self, records) -> int:
+    """Write as many of a list of records as fit, with at most two copies; returns how many."""
+    counters = self.counters
+    tail = counters[_TAIL]
+    count = min(len(records), self.capacity - (tail - counters[_HEAD]))
+    if count <= 0:
+      return 0
+    pack = self.record.pack
+    data = b"".join([pack(*values) for values in records[:count]])
+    self._copy_run(tail, count, data)
+    counters[_TAIL] = tail + count
+    return count
+  
+  def get_many(self, n):
+    """Read up to n records, oldest first, as a list of tuples."""
+    counters = self.counters
+    head = counters[_HEAD]
+    count = min(n, counters[_TAIL] - head)
+    if count <= 0:
+      return []
+    size = self.record.size
+    start = head % self.capacity
+    first = min(count, self.capacity - start)
+    offset = _SHARED_HEADER + start * size
+    records = list(self.record.iter_unpack(self.buf[offset:offset + first * size]))
+    if first < count:
+      records += self.record.iter_unpack(self.buf[_SHARED_HEADER:_SHARED_HEADER + (count - first) * size])
+    counters[_HEAD] = head + count
+    return records
+  
+  def _copy_run(self, position, count, data):
+    size = self.record.size
+    start = position % self.capacity
+    first = min(count, self.capacity - start)
+    offset = _SHARED_HEADER + start * size
+    self.buf[offset:offset + first * size] = data[:first * size]
+    if first < count:
+      self.buf[_SHARED_HEADER:_SHARED_HEADER + (count - first) * size] = data[first * size:]
+  
+  def put(self, values, timeout=None):
+    """try_put(), polling with a growing pause until there is room; Full after timeout seconds."""
+    _wait_until(lambda: self.try_put(values), timeout, Full)
+  
+  def get(self, timeout=None):
+    """try_get(), polling with a growing pause until a record arrives; Empty after timeout seconds."""
+    values = None
+    
+    def arrived():
+      nonlocal values
+      values = self.try_get()
+      return values is not None
+    
+    _wait_until(arrived, timeout, Empty)
+    return values
+  
+  def close(self):
+    """Detach from the block; the other process is unaffected."""
+    self.counters.release()
+    self.buf = self.counters = None
+    self.shm.close()
+  
+  def unlink(self):
+    """Destroy the block once both sides have closed it; call from the creating process."""
+    self.shm.unlink()
+
+
+def _wait_until(ready, timeout, error):
+  # There is no cross-process condition variable to wait on, so poll, backing off
+  # from a bare yield to at most a millisecond between checks.
+  deadline = None if timeout is None else time.monotonic() + timeout
+  pause = 0.0
+  while not ready():
+    if deadline is not None and time.monotonic() >= deadline:
+      raise error
+    time.sleep(pause)
+    pause = min(pause * 2 or 1e-6, 1e-3)
 
 
 def test_queue():
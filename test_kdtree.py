@@ -0,0 +1,497 @@
+import math
+import random
+
+import pytest
+
+from kdtree import KDTree, kdtree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def brute_force(points, target):
+    """Points sorted by distance to target, used as the reference answer"""
+    return sorted(points, key=lambda p: math.dist(p, target))
+
+
+def random_points(n, k, seed=0):
+    rng = random.Random(seed)
+    return [tuple(rng.uniform(-100, 100) for _ in range(k)) for _ in range(n)]
+
+
+class TestKDTreeBuild:
+    """Tests for the flat array layout built by KDTree"""
+
+    def test_empty_tree(self):
+        tree = KDTree([])
+        assert len(tree) == 0
+        assert tree.root == -1
+        assert tree.nearest((0, 0)) is None
+        assert tree.knn((0, 0), 3) == []
+        assert tree.radius((0, 0), 10) == []
+
+    def test_single_point(self):
+        tree = KDTree([(3, 4)])
+        assert len(tree) == 1
+        assert tree.nearest((0, 0)) == (3, 4)
+
+    def test_every_point_is_reachable_once(self):
+        points = random_points(200, 2)
+        tree = KDTree(points)
+
+        seen = []
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            seen.append(node)
+            for child in (tree.left[node], tree.right[node]):
+                if child != -1:
+                    stack.append(child)
+
+        assert sorted(seen) == list(range(len(points)))
+        assert sorted(tree.ids) == list(range(len(points)))
+        for node in range(len(points)):
+            assert tree.point(node) == points[tree.ids[node]]
+
+    def test_splitting_invariant(self):
+        """Every point in the left subtree is <= the node on its axis, every point on the right is >="""
+        points = random_points(300, 3, seed=1)
+        tree = KDTree(points)
+
+        def subtree(node):
+            if node == -1:
+                return []
+            return [node] + subtree(tree.left[node]) + subtree(tree.right[node])
+
+        for node in range(len(points)):
+            axis = tree.axes[node]
+            value = tree.point(node)[axis]
+            assert all(tree.point(n)[axis] <= value for n in subtree(tree.left[node]))
+            assert all(tree.point(n)[axis] >= value for n in subtree(tree.right[node]))
+
+    def test_tree_is_balanced(self):
+        points = random_points(1023, 2, seed=2)
+        tree = KDTree(points)
+
+        def height(node):
+            if node == -1:
+                return 0
+            return 1 + max(height(tree.left[node]), height(tree.right[node]))
+
+        assert height(tree.root) == 10
+
+    def test_sorted_and_duplicate_input(self):
+        points = [(i, i) for i in range(100)] + [(5, 5)] * 20
+        tree = KDTree(points)
+        assert len(tree) == 120
+        assert tree.nearest((5.1, 4.9)) == (5, 5)
+
+    def test_legacy_kdtree_still_works(self):
+        result = kdtree([(0, 0), (1, 0), (2, 2)], 0, 2)
+        assert result["location"] == (1, 0)
+
+
+class TestKDTreeQueries:
+    """Query results must match a brute force linear scan"""
+
+    @pytest.mark.parametrize("k", [1, 2, 3, 5])
+    def test_nearest_matches_brute_force(self, k):
+        points = random_points(500, k, seed=k)
+        tree = KDTree(points)
+        for target in random_points(50, k, seed=100 + k):
+            expected = brute_force(points, target)[0]
+            assert math.dist(tree.nearest(target), target) == pytest.approx(math.dist(expected, target))
+
+    def test_nearest_exact_hit(self):
+        points = random_points(100, 2)
+        tree = KDTree(points)
+        for p in points[:10]:
+            assert tree.nearest(p) == p
+
+    @pytest.mark.parametrize("count", [1, 5, 20])
+    def test_knn_matches_brute_force(self, count):
+        points = random_points(400, 2, seed=3)
+        tree = KDTree(points)
+        for target in random_points(30, 2, seed=4):
+            result = tree.knn(target, count)
+            expected = brute_force(points, target)[:count]
+            assert [math.dist(p, target) for p in result] == pytest.approx([math.dist(p, target) for p in expected])
+
+    def test_knn_more_than_size(self):
+        points = [(0, 0), (1, 1), (2, 2)]
+        tree = KDTree(points)
+        assert tree.knn((0, 0), 10) == [(0, 0), (1, 1), (2, 2)]
+        assert tree.knn((0, 0), 0) == []
+
+    def test_radius_matches_brute_force(self):
+        points = random_points(400, 3, seed=5)
+        tree = KDTree(points)
+        for target in random_points(20, 3, seed=6):
+            result = tree.radius(target, 30)
+            expected = [p for p in brute_force(points, target) if math.dist(p, target) <= 30]
+            assert sorted(result) == sorted(expected)
+
+    def test_radius_is_inclusive(self):
+        tree = KDTree([(0, 0), (3, 4), (6, 8)])
+        assert tree.radius((0, 0), 5) == [(0, 0), (3, 4)]
+        assert tree.radius((0, 0), 4.99) == [(0, 0)]
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+class TestKDTreeNumpy:
+    """Tests for the NumPy bulk build and batched k-NN"""
+
+    def brute_force_knn(self, points, queries, k):
+        dist = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+        return np.sort(dist, axis=1)[:, :k]
+
+    def test_from_array_matches_tuple_build_layout(self):
+        points = np.random.default_rng(0).uniform(-100, 100, size=(300, 3))
+        tree = KDTree.from_array(points)
+
+        assert len(tree) == 300
+        assert sorted(tree.ids) == list(range(300))
+        for node in range(300):
+            assert tree.point(node) == tuple(points[tree.ids[node]])
+        for target in points[:20]:
+            assert tree.nearest(tuple(target)) == tuple(target)
+
+    def test_from_array_queries_match_brute_force(self):
+        points = np.random.default_rng(1).uniform(-100, 100, size=(500, 2))
+        tree = KDTree.from_array(points)
+        for target in np.random.default_rng(2).uniform(-100, 100, size=(20, 2)):
+            result = tree.knn(tuple(target), 4)
+            expected = self.brute_force_knn(points, target[None, :], 4)[0]
+            assert [math.dist(p, target) for p in result] == pytest.approx(list(expected))
+
+    def test_from_array_rejects_bad_shape(self):
+        with pytest.raises(ValueError):
+            KDTree.from_array(np.zeros(5))
+
+    def test_from_array_empty(self):
+        tree = KDTree.from_array(np.zeros((0, 3)))
+        assert len(tree) == 0
+        assert tree.nearest((0, 0, 0)) is None
+
+    @pytest.mark.parametrize("n, k, leaf_size", [(1, 1, 64), (50, 3, 64), (2000, 5, 16), (2000, 1, 4), (3000, 100, 64)])
+    def test_knn_batch_matches_brute_force(self, n, k, leaf_size):
+        rng = np.random.default_rng(n + k)
+        points = rng.uniform(-100, 100, size=(n, 3))
+        queries = rng.uniform(-120, 120, size=(200, 3))
+        tree = KDTree.from_array(points)
+
+        ids, dist = tree.knn_batch(queries, k, leaf_size=leaf_size)
+
+        expected = self.brute_force_knn(points, queries, k)
+        count = min(n, k)
+        assert ids.shape == dist.shape == (200, k)
+        assert np.allclose(dist[:, :count], expected)
+        # ids point at input rows that really are at the reported distance
+        assert np.allclose(np.sqrt(((points[ids[:, :count]] - queries[:, None, :]) ** 2).sum(axis=2)), dist[:, :count])
+        assert (ids[:, count:] == -1).all()
+        assert np.isinf(dist[:, count:]).all()
+
+    def test_knn_batch_in_chunks(self, monkeypatch):
+        rng = np.random.default_rng(3)
+        points = rng.uniform(-100, 100, size=(3000, 3))
+        queries = rng.uniform(-120, 120, size=(250, 3))
+        tree = KDTree.from_array(points)
+        expected = tree.knn_batch(queries, 4)
+
+        # a chunk size that does not divide the number of queries
+        monkeypatch.setattr("kdtree._HOME_CHUNK", 64)
+        ids, dist = tree.knn_batch(queries, 4)
+
+        assert np.array_equal(dist, expected[1])
+        assert np.allclose(dist, self.brute_force_knn(points, queries, 4))
+
+    def test_knn_batch_on_tuple_built_tree(self):
+        points = random_points(400, 2, seed=9)
+        tree = KDTree(points)
+        queries = np.array(random_points(50, 2, seed=10))
+
+        ids, dist = tree.knn_batch(queries, 3)
+
+        for row, target in enumerate(queries):
+            expected = brute_force(points, tuple(target))[:3]
+            assert list(dist[row]) == pytest.approx([math.dist(p, target) for p in expected])
+            assert [math.dist(points[i], target) for i in ids[row]] == pytest.approx(list(dist[row]))
+
+    def test_knn_batch_with_duplicates(self):
+        points = np.array([[1.0, 1.0]] * 100 + [[5.0, 5.0]])
+        tree = KDTree.from_array(points)
+        ids, dist = tree.knn_batch(np.array([[1.0, 1.0], [5.0, 5.0]]), 2)
+        assert (dist[0] == 0).all()
+        assert dist[1].tolist() == pytest.approx([0.0, math.dist((1, 1), (5, 5))])
+        assert ids[1, 0] == 100
+
+    def test_knn_batch_rejects_bad_shape(self):
+        tree = KDTree.from_array(np.zeros((10, 3)))
+        with pytest.raises(ValueError):
+            tree.knn_batch(np.zeros((4, 2)), 1)
+
+    def test_knn_batch_empty_inputs(self):
+        ids, dist = KDTree([]).knn_batch(np.zeros((3, 0)), 2)
+        assert ids.shape == (3, 2) and (ids == -1).all()
+        ids, dist = KDTree.from_array(np.zeros((10, 2))).knn_batch(np.zeros((0, 2)), 2)
+        assert ids.shape == (0, 2)
+
+    @pytest.mark.parametrize("workers", [2, 3, 5])
+    def test_parallel_build_matches_serial_build(self, workers):
+        points = np.random.default_rng(workers).uniform(-100, 100, size=(5000, 3))
+        serial = KDTree.from_array(points)
+        parallel = KDTree.from_array(points, workers=workers)
+
+        assert parallel.root == serial.root
+        assert list(parallel.left) == list(serial.left)
+        assert list(parallel.right) == list(serial.right)
+        assert list(parallel.axes) == list(serial.axes)
+        assert sorted(parallel.ids) == list(range(5000))
+        for node in range(0, 5000, 50):
+            assert parallel.point(node) == tuple(points[parallel.ids[node]])
+
+        queries = np.random.default_rng(0).uniform(-100, 100, size=(100, 3))
+        _, expected = serial.knn_batch(queries, 4)
+        _, dist = parallel.knn_batch(queries, 4)
+        assert np.allclose(dist, expected)
+
+    def test_parallel_build_small_input(self):
+        points = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+        tree = KDTree.from_array(points, workers=4)
+        assert tree.nearest((3, 4)) == (3, 4)
+
+
+def tree_height(tree, node=None):
+    node = tree.root if node is None else node
+    if node == -1:
+        return 0
+    return 1 + max(tree_height(tree, tree.left[node]), tree_height(tree, tree.right[node]))
+
+
+class TestKDTreeUpdates:
+    """Tests for insert / delete with scapegoat rebuilding"""
+
+    def test_insert_into_empty_tree(self):
+        tree = KDTree([], 2)
+        assert tree.insert((1, 2)) == 0
+        assert tree.insert((3, 4)) == 1
+        assert len(tree) == 2
+        assert tree.nearest((0, 0)) == (1, 2)
+        assert tree.knn((5, 5), 2) == [(3, 4), (1, 2)]
+
+    def test_insert_into_empty_tree_without_k(self):
+        tree = KDTree([])
+        assert tree.insert((1, 2)) == 0
+        assert tree.k == 2
+        for p in random_points(200, 2, seed=30):
+            tree.insert(p)
+        assert len(tree) == 201
+        assert tree.nearest((1.1, 2.1)) == (1, 2)
+        with pytest.raises(ValueError):
+            tree.insert((1, 2, 3))
+
+    def test_delete_from_empty_tree_without_k(self):
+        tree = KDTree([])
+        assert tree.delete((1, 2)) is False
+        # the failed delete must not fix the dimension
+        assert tree.insert((1, 2, 3)) == 0
+        assert tree.k == 3
+        assert tree.nearest((1, 2, 3)) == (1, 2, 3)
+
+    def test_insert_returns_next_id(self):
+        tree = KDTree(random_points(10, 2))
+        assert tree.insert((0.5, 0.5)) == 10
+        assert tree.insert((0.25, 0.25)) == 11
+
+    def test_insert_rejects_wrong_dimension(self):
+        tree = KDTree([(0, 0)])
+        with pytest.raises(ValueError):
+            tree.insert((1, 2, 3))
+        with pytest.raises(ValueError):
+            tree.delete((1,))
+
+    def test_sorted_inserts_stay_balanced(self):
+        """Inserting in sorted order would degrade to a list without rebuilding"""
+        tree = KDTree([], 2)
+        for i in range(2000):
+            tree.insert((i, i))
+        assert len(tree) == 2000
+        assert tree_height(tree) <= math.log(2000, 1 / KDTree.alpha) + 2
+        assert tree.nearest((1000.2, 999.9)) == (1000, 1000)
+
+    def test_delete(self):
+        points = random_points(100, 2)
+        tree = KDTree(points)
+        assert tree.delete(points[0])
+        assert len(tree) == 99
+        assert tree.nearest(points[0]) != points[0]
+        assert not tree.delete(points[0])
+        assert not tree.delete((1000, 1000))
+
+    def test_delete_one_duplicate_at_a_time(self):
+        tree = KDTree([(1, 1)] * 3 + [(5, 5)])
+        assert tree.delete((1, 1))
+        assert tree.knn((1, 1), 3) == [(1, 1), (1, 1), (5, 5)]
+        assert tree.delete((1, 1))
+        assert tree.delete((1, 1))
+        assert not tree.delete((1, 1))
+        assert tree.knn((1, 1), 3) == [(5, 5)]
+
+    def test_delete_everything(self):
+        points = random_points(50, 3)
+        tree = KDTree(points)
+        for p in points:
+            assert tree.delete(p)
+        assert len(tree) == 0
+        assert tree.nearest((0, 0, 0)) is None
+        tree.insert((1, 1, 1))
+        assert tree.nearest((0, 0, 0)) == (1, 1, 1)
+
+    def test_tombstones_are_reclaimed(self):
+        points = random_points(1000, 2)
+        tree = KDTree(points)
+        for p in points[:900]:
+            tree.delete(p)
+        assert len(tree.ids) - len(tree) <= KDTree.max_dead_ratio * len(tree.ids)
+        assert sorted(tree.radius((0, 0), 1000)) == sorted(points[900:])
+
+    def test_random_churn_matches_brute_force(self):
+        rng = random.Random(7)
+        live = random_points(300, 2, seed=8)
+        tree = KDTree(live)
+        for step in range(3000):
+            if live and rng.random() < 0.45:
+                p = live.pop(rng.randrange(len(live)))
+                assert tree.delete(p)
+            else:
+                p = (rng.uniform(-100, 100), rng.uniform(-100, 100))
+                live.append(p)
+                tree.insert(p)
+
+            if step % 100 == 0:
+                target = (rng.uniform(-100, 100), rng.uniform(-100, 100))
+                expected = brute_force(live, target)[:5]
+                assert [math.dist(p, target) for p in tree.knn(target, 5)] == pytest.approx([math.dist(p, target) for p in expected])
+        assert len(tree) == len(live)
+        assert sorted(tree.radius((0, 0), 1000)) == sorted(live)
+
+    @pytest.mark.skipif(np is None, reason="numpy is not installed")
+    def test_knn_batch_after_updates(self):
+        rng = random.Random(11)
+        points = random_points(3000, 3, seed=12)
+        tree = KDTree.from_array(np.array(points))
+        live = dict(enumerate(points))
+        for _ in range(1500):
+            key = rng.choice(list(live))
+            assert tree.delete(live.pop(key))
+        for _ in range(1500):
+            p = tuple(rng.uniform(-100, 100) for _ in range(3))
+            live[tree.insert(p)] = p
+
+        queries = np.array(random_points(100, 3, seed=13))
+        ids, dist = tree.knn_batch(queries, 6, leaf_size=16)
+
+        keys = list(live)
+        coords = np.array([live[key] for key in keys])
+        expected = np.sort(np.sqrt(((queries[:, None, :] - coords[None]) ** 2).sum(axis=2)), axis=1)[:, :6]
+        assert np.allclose(dist, expected)
+        for row in range(len(queries)):
+            assert [math.dist(live[i], queries[row]) for i in ids[row]] == pytest.approx(list(dist[row]))
+
+
+class TestKDTreeIndexFile:
+    """Tests for save() / load() of the memory-mapped index format"""
+
+    def test_round_trip(self, tmp_path):
+        points = random_points(500, 3, seed=20)
+        tree = KDTree(points)
+        path = tmp_path / "points.kdt"
+        tree.save(path)
+
+        loaded = KDTree.load(path)
+        assert len(loaded) == 500
+        assert loaded.k == 3
+        assert isinstance(loaded.coords, memoryview)
+        for target in random_points(20, 3, seed=21):
+            assert loaded.knn(target, 5) == tree.knn(target, 5)
+            assert loaded.radius(target, 25) == tree.radius(target, 25)
+        loaded.close()
+        assert len(loaded) == 0
+
+    def test_round_trip_after_updates(self, tmp_path):
+        points = random_points(300, 2, seed=22)
+        tree = KDTree(points)
+        for p in points[:40]:
+            tree.delete(p)
+        for p in random_points(60, 2, seed=23):
+            tree.insert(p)
+        path = tmp_path / "points.kdt"
+        tree.save(path)
+
+        loaded = KDTree.load(path)
+        assert len(loaded) == len(tree)
+        assert loaded.next_id == tree.next_id
+        assert sorted(loaded.radius((0, 0), 1000)) == sorted(tree.radius((0, 0), 1000))
+        loaded.close()
+
+    def test_empty_tree(self, tmp_path):
+        path = tmp_path / "empty.kdt"
+        KDTree([], 2).save(path)
+        loaded = KDTree.load(path)
+        assert len(loaded) == 0
+        assert loaded.nearest((0, 0)) is None
+        loaded.close()
+
+    def test_loaded_tree_is_read_only(self, tmp_path):
+        path = tmp_path / "points.kdt"
+        KDTree([(0, 0), (1, 1)]).save(path)
+        loaded = KDTree.load(path)
+        with pytest.raises(TypeError):
+            loaded.insert((2, 2))
+        with pytest.raises(TypeError):
+            loaded.delete((0, 0))
+        loaded.close()
+
+    def test_rejects_foreign_and_truncated_files(self, tmp_path):
+        path = tmp_path / "bad.kdt"
+        path.write_bytes(b"not an index at all" * 10)
+        with pytest.raises(ValueError):
+            KDTree.load(path)
+
+        KDTree(random_points(10, 2)).save(path)
+        data = path.read_bytes()
+        # cuts that are not a multiple of 8 used to fail inside memoryview.cast with TypeError
+        for cut in (1, 7, 8, 9, 13, 30):
+            path.write_bytes(data[:-cut])
+            with pytest.raises(ValueError):
+                KDTree.load(path)
+        path.write_bytes(data + b"\0")
+        with pytest.raises(ValueError):
+            KDTree.load(path)
+
+    def test_refuses_big_endian_machines(self, tmp_path, monkeypatch):
+        path = tmp_path / "points.kdt"
+        tree = KDTree([(0, 0), (1, 1)])
+        tree.save(path)
+        monkeypatch.setattr("sys.byteorder", "big")
+        with pytest.raises(ValueError):
+            tree.save(tmp_path / "other.kdt")
+        with pytest.raises(ValueError):
+            KDTree.load(path)
+
+    @pytest.mark.skipif(np is None, reason="numpy is not installed")
+    def test_knn_batch_on_loaded_tree(self, tmp_path):
+        points = np.random.default_rng(24).uniform(-100, 100, size=(2000, 3))
+        tree = KDTree.from_array(points)
+        path = tmp_path / "points.kdt"
+        tree.save(path)
+
+        loaded = KDTree.load(path)
+        queries = np.random.default_rng(25).uniform(-100, 100, size=(50, 3))
+        expected_ids, expected_dist = tree.knn_batch(queries, 4)
+        ids, dist = loaded.knn_batch(queries, 4)
+        assert (ids == expected_ids).all()
+        assert np.allclose(dist, expected_dist)
+        loaded.close()
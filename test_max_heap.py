@@ -1,6 +1,6 @@
 import pytest
 import math
-from max_heap import Heap
+from max_heap import DaryHeap, Heap, IndexedHeap, KeyHeap, top_k
 
 
 class TestHeapInsert:
@@ -401,6 +401,543 @@ class TestHeapDelete:
                     f"Heap property violated: parent {heap.array[i]} < right child {heap.array[right_child]} at index {i}"
 
 
+class TestHeapStorage:
+    """from_iterable, 배열 확장, typed array 저장소를 테스트하는 클래스"""
+    
+    def test_from_iterable_builds_valid_heap(self):
+        """from_iterable 로 만든 힙이 heap property 를 만족하는지 테스트"""
+        import random
+        values = list(range(500))
+        random.shuffle(values)
+        
+        heap = Heap.from_iterable(values)
+        
+        assert heap.last_index == 500
+        assert heap.peek() == 499
+        self._verify_heap_property(heap)
+    
+    def test_from_iterable_empty(self):
+        """빈 iterable 로 힙 생성 테스트"""
+        heap = Heap.from_iterable([])
+        
+        assert heap.last_index == 0
+        assert heap.peek() is None
+        heap.insert(3)
+        assert heap.peek() == 3
+    
+    def test_from_iterable_accepts_generator(self):
+        """generator 로도 힙을 만들 수 있는지 테스트"""
+        heap = Heap.from_iterable(x * 3 % 7 for x in range(7))
+        
+        extracted = [heap.delete_root() for _ in range(7)]
+        assert extracted == [6, 5, 4, 3, 2, 1, 0]
+    
+    def test_from_iterable_then_insert_and_delete(self):
+        """from_iterable 로 만든 힙에 삽입/삭제가 정상 동작하는지 테스트"""
+        heap = Heap.from_iterable([5, 1, 9, 3])
+        heap.insert(7)
+        heap.insert(10)
+        
+        extracted = []
+        while heap.last_index > 0:
+            extracted.append(heap.delete_root())
+        assert extracted == [10, 9, 7, 5, 3, 1]
+    
+    def test_grow_doubles_capacity(self):
+        """배열이 고정 크기가 아니라 두 배씩 늘어나는지 테스트"""
+        heap = Heap()
+        capacities = set()
+        for i in range(1000):
+            heap.insert(i)
+            capacities.add(len(heap.array))
+        
+        assert sorted(capacities) == [100, 200, 400, 800, 1600]
+        self._verify_heap_property(heap)
+    
+    def test_typed_array_float_heap(self):
+        """array('d') 저장소 테스트"""
+        heap = Heap('d')
+        values = [3.5, -1.25, 10.0, 2.0, 7.75]
+        for value in values:
+            heap.insert(value)
+        
+        assert heap.array.typecode == 'd'
+        assert heap.peek() == 10.0
+        extracted = [heap.delete_root() for _ in values]
+        assert extracted == sorted(values, reverse=True)
+        assert heap.delete_root() is None
+    
+    def test_typed_array_int_heap_grows(self):
+        """array('q') 저장소에서 배열 확장 테스트"""
+        import random
+        values = [random.randint(-10**12, 10**12) for _ in range(1000)]
+        heap = Heap('q')
+        for value in values:
+            heap.insert(value)
+        
+        assert heap.array.typecode == 'q'
+        self._verify_heap_property(heap)
+        assert [heap.delete_root() for _ in range(10)] == sorted(values, reverse=True)[:10]
+    
+    def test_typed_array_from_iterable(self):
+        """typed array 저장소로 from_iterable 테스트"""
+        heap = Heap.from_iterable([4, 8, 1, 6], typecode='q')
+        
+        assert heap.array.typecode == 'q'
+        assert heap.array[0] == 0  # 인덱스 0은 사용하지 않음
+        assert heap.peek() == 8
+        self._verify_heap_property(heap)
+    
+    def test_typed_array_delete_clears_slot(self):
+        """typed array 에서는 삭제된 칸이 None 대신 0 으로 채워지는지 테스트"""
+        heap = Heap('q')
+        heap.insert(5)
+        heap.insert(3)
+        
+        assert heap.delete(2) == True
+        assert heap.array[2] == 0
+        assert heap.last_index == 1
+    
+    def _verify_heap_property(self, heap):
+        """heap property가 유지되는지 확인하는 헬퍼 메서드"""
+        for i in range(1, heap.last_index + 1):
+            left_child = 2 * i
+            right_child = 2 * i + 1
+            
+            if left_child <= heap.last_index:
+                assert heap.array[i] >= heap.array[left_child], \
+                    f"Heap property violated: parent {heap.array[i]} < left child {heap.array[left_child]} at index {i}"
+            
+            if right_child <= heap.last_index:
+                assert heap.array[i] >= heap.array[right_child], \
+                    f"Heap property violated: parent {heap.array[i]} < right child {heap.array[right_child]} at index {i}"
+
+class TestIndexedHeap:
+    """IndexedHeap 의 handle 기반 기능을 테스트하는 클래스"""
+    
+    def test_push_and_pop_in_priority_order(self):
+        """우선순위 순서대로 꺼내지는지 테스트"""
+        heap = IndexedHeap()
+        for name, priority in [("a", 3), ("b", 10), ("c", 1), ("d", 7)]:
+            heap.push(name, priority)
+        
+        assert len(heap) == 4
+        assert heap.peek() == ("b", 10)
+        assert [heap.pop() for _ in range(4)] == [("b", 10), ("d", 7), ("a", 3), ("c", 1)]
+        assert heap.pop() is None
+        assert heap.peek() is None
+    
+    def test_handles_are_unique(self):
+        """push 가 매번 다른 handle 을 반환하는지 테스트"""
+        heap = IndexedHeap()
+        handles = [heap.push(i, i) for i in range(50)]
+        
+        assert len(set(handles)) == 50
+        assert all(handle in heap for handle in handles)
+    
+    def test_increase_priority(self):
+        """우선순위를 올리면 루트로 올라오는지 테스트"""
+        heap = IndexedHeap()
+        handles = {name: heap.push(name, priority) for name, priority in [("a", 1), ("b", 2), ("c", 3)]}
+        
+        assert heap.update_priority(handles["a"], 100) == True
+        assert heap.peek() == ("a", 100)
+        assert heap.priority(handles["a"]) == 100
+        self._verify_heap_property(heap)
+    
+    def test_decrease_priority(self):
+        """우선순위를 내리면 아래로 내려가는지 테스트"""
+        heap = IndexedHeap()
+        handles = {name: heap.push(name, priority) for name, priority in [("a", 1), ("b", 2), ("c", 3)]}
+        
+        assert heap.update_priority(handles["c"], 0) == True
+        assert [heap.pop() for _ in range(3)] == [("b", 2), ("a", 1), ("c", 0)]
+    
+    def test_remove_by_handle(self):
+        """handle 로 중간 원소를 삭제하는 테스트"""
+        heap = IndexedHeap()
+        handles = [heap.push(f"job{i}", i) for i in range(20)]
+        
+        assert heap.remove(handles[10]) == True
+        assert handles[10] not in heap
+        assert len(heap) == 19
+        self._verify_heap_property(heap)
+        
+        popped = [heap.pop()[1] for _ in range(19)]
+        assert popped == [i for i in range(19, -1, -1) if i != 10]
+    
+    def test_unknown_or_stale_handle(self):
+        """없는 handle 이나 이미 삭제된 handle 테스트"""
+        heap = IndexedHeap()
+        handle = heap.push("a", 1)
+        heap.pop()
+        
+        assert heap.update_priority(handle, 5) == False
+        assert heap.remove(handle) == False
+        assert heap.priority(handle) is None
+        assert heap.remove(12345) == False
+    
+    def test_random_operations_match_reference(self):
+        """무작위 push / update / remove / pop 이 기준 구현과 같은 결과를 내는지 테스트"""
+        import random
+        rng = random.Random(0)
+        heap = IndexedHeap()
+        reference = {}
+        
+        for step in range(3000):
+            choice = rng.random()
+            if choice < 0.4 or not reference:
+                priority = rng.randint(0, 100)
+                reference[heap.push(step, priority)] = priority
+            elif choice < 0.7:
+                handle = rng.choice(list(reference))
+                reference[handle] = rng.randint(0, 100)
+                assert heap.update_priority(handle, reference[handle])
+            elif choice < 0.85:
+                handle = rng.choice(list(reference))
+                del reference[handle]
+                assert heap.remove(handle)
+            else:
+                _, priority = heap.pop()
+                assert priority == max(reference.values())
+                reference = {h: p for h, p in reference.items() if h in heap}
+            
+            assert len(heap) == len(reference)
+        self._verify_heap_property(heap)
+        for handle, priority in reference.items():
+            assert heap.priority(handle) == priority
+    
+    def test_grows_past_initial_capacity(self):
+        """초기 배열 크기를 넘겨도 동작하는지 테스트"""
+        heap = IndexedHeap()
+        for i in range(250):
+            heap.push(i, i)
+        
+        assert len(heap.array) >= 251
+        assert heap.peek() == (249, 249)
+        self._verify_heap_property(heap)
+    
+    def _verify_heap_property(self, heap):
+        """heap property 와 position 표가 일치하는지 확인하는 헬퍼 메서드"""
+        for i in range(1, heap.last_index + 1):
+            assert heap.position[heap.handles[i]] == i
+            for child in (2 * i, 2 * i + 1):
+                if child <= heap.last_index:
+                    assert heap.array[i] >= heap.array[child], \
+                        f"Heap property violated: parent {heap.array[i]} < child {heap.array[child]} at index {i}"
+
+class TestKeyHeap:
+    """KeyHeap 의 key / reverse / 안정 정렬 기능을 테스트하는 클래스"""
+    
+    def test_default_is_min_heap(self):
+        """기본값(reverse=False)은 sorted() 처럼 작은 값부터 나오는지 테스트"""
+        heap = KeyHeap()
+        values = [5, 3, 8, 1, 9, 2]
+        for value in values:
+            heap.insert(value)
+        
+        assert len(heap) == 6
+        assert heap.peek() == 1
+        assert [heap.delete_root() for _ in values] == sorted(values)
+        assert heap.delete_root() is None
+    
+    def test_reverse_is_max_heap(self):
+        """reverse=True 이면 큰 값부터 나오는지 테스트"""
+        heap = KeyHeap(reverse=True)
+        values = [5, 3, 8, 1, 9, 2]
+        for value in values:
+            heap.insert(value)
+        
+        assert [heap.delete_root() for _ in values] == sorted(values, reverse=True)
+    
+    def test_key_function(self):
+        """key 함수로 순서를 정하는 테스트"""
+        heap = KeyHeap(key=len)
+        words = ["banana", "fig", "apple", "kiwi"]
+        for word in words:
+            heap.insert(word)
+        
+        assert [heap.delete_root() for _ in words] == ["fig", "kiwi", "apple", "banana"]
+    
+    def test_key_called_once_per_insert(self):
+        """key 함수가 비교마다가 아니라 삽입마다 한 번만 호출되는지 테스트"""
+        calls = []
+        def key(value):
+            calls.append(value)
+            return -value
+        
+        heap = KeyHeap(key=key)
+        for value in range(500):
+            heap.insert(value)
+        while len(heap):
+            heap.delete_root()
+        
+        assert len(calls) == 500
+    
+    def test_ties_keep_insertion_order(self):
+        """키가 같은 원소는 먼저 넣은 것이 먼저 나오는지 테스트 (min / max 모두)"""
+        records = [("b", 1), ("a", 2), ("c", 1), ("d", 2), ("e", 1)]
+        for reverse in (False, True):
+            heap = KeyHeap(key=lambda record: record[1], reverse=reverse)
+            for record in records:
+                heap.insert(record)
+            
+            popped = [heap.delete_root() for _ in records]
+            assert popped == sorted(records, key=lambda record: record[1], reverse=reverse)
+    
+    def test_from_iterable_is_stable(self):
+        """from_iterable 로 만든 힙도 안정 정렬 순서를 지키는지 테스트"""
+        import random
+        rng = random.Random(1)
+        records = [(rng.randint(0, 9), i) for i in range(300)]
+        
+        heap = KeyHeap.from_iterable(records, key=lambda record: record[0], reverse=True)
+        heap.insert((5, 300))
+        records.append((5, 300))
+        
+        popped = [heap.delete_root() for _ in records]
+        assert popped == sorted(records, key=lambda record: record[0], reverse=True)
+    
+    def test_from_iterable_without_key(self):
+        """key 없이 from_iterable 테스트"""
+        heap = KeyHeap.from_iterable([3, 1, 2])
+        assert [heap.delete_root() for _ in range(3)] == [1, 2, 3]
+    
+    def test_grows_past_initial_capacity(self):
+        """초기 배열 크기를 넘겨도 동작하는지 테스트"""
+        heap = KeyHeap(reverse=True)
+        for i in range(1000):
+            heap.insert(i % 37)
+        
+        assert len(heap) == 1000
+        assert [heap.delete_root() for _ in range(1000)] == sorted((i % 37 for i in range(1000)), reverse=True)
+    
+    def test_newest_first_ties(self):
+        """newest_first=True 이면 키가 같은 원소는 나중에 넣은 것이 먼저 나오는지 테스트"""
+        records = [("b", 1), ("a", 2), ("c", 1), ("d", 2), ("e", 1)]
+        by_count = lambda record: record[1]
+        expected = sorted(reversed(records), key=by_count)
+        
+        heap = KeyHeap(key=by_count, newest_first=True)
+        for record in records:
+            heap.insert(record)
+        assert [heap.delete_root() for _ in records] == expected
+        
+        heap = KeyHeap.from_iterable(records, key=by_count, newest_first=True)
+        assert [heap.delete_root() for _ in records] == expected
+    
+    def test_pushpop(self):
+        """pushpop 이 insert 후 delete_root 와 같은 값을 꺼내는지 테스트 (키가 같을 때 포함)"""
+        import random
+        rng = random.Random(2)
+        for reverse in (False, True):
+            for newest_first in (False, True):
+                fast = KeyHeap(key=lambda record: record[0], reverse=reverse, newest_first=newest_first)
+                slow = KeyHeap(key=lambda record: record[0], reverse=reverse, newest_first=newest_first)
+                assert fast.pushpop((1, -1)) == (1, -1)
+                for i in range(300):
+                    record = (rng.randint(0, 9), i)
+                    if i < 20:
+                        fast.insert(record)
+                        slow.insert(record)
+                        continue
+                    slow.insert(record)
+                    assert fast.pushpop(record) == slow.delete_root()
+                assert [fast.delete_root() for _ in range(20)] == [slow.delete_root() for _ in range(20)]
+    
+    def test_pushpop_many(self):
+        """pushpop_many 가 pushpop 을 하나씩 부른 것과 같은 힙을 남기는지 테스트"""
+        import random
+        rng = random.Random(3)
+        records = [(rng.randint(0, 9), i) for i in range(500)]
+        for reverse in (False, True):
+            for newest_first in (False, True):
+                many = KeyHeap.from_iterable(records[:30], key=lambda record: record[0], reverse=reverse, newest_first=newest_first)
+                one = KeyHeap.from_iterable(records[:30], key=lambda record: record[0], reverse=reverse, newest_first=newest_first)
+                many.pushpop_many(iter(records[30:]))
+                for record in records[30:]:
+                    one.pushpop(record)
+                
+                assert len(many) == 30
+                assert [many.delete_root() for _ in range(30)] == [one.delete_root() for _ in range(30)]
+        
+        empty = KeyHeap()
+        empty.pushpop_many([3, 1, 2])
+        assert len(empty) == 0
+
+class TestHeapBulkOperations:
+    """push_many / pop_n / pushpop / replace / top_k 를 테스트하는 클래스"""
+    
+    def test_push_many_small_batch(self):
+        """힙에 비해 작은 배치는 하나씩 삽입되는지 테스트"""
+        heap = Heap.from_iterable(range(1000))
+        heap.push_many([5000, -1, 500])
+        
+        assert heap.last_index == 1003
+        assert heap.peek() == 5000
+        self._verify_heap_property(heap)
+    
+    def test_push_many_large_batch(self):
+        """큰 배치는 이어 붙인 뒤 heapify 되는지 테스트"""
+        import random
+        values = list(range(5000))
+        random.shuffle(values)
+        heap = Heap()
+        heap.insert(10)
+        heap.push_many(values)
+        
+        assert heap.last_index == 5001
+        assert len(heap.array) > 5001
+        self._verify_heap_property(heap)
+        assert heap.pop_n(3) == [4999, 4998, 4997]
+    
+    def test_push_many_typed_array(self):
+        """typed array 힙에 push_many 테스트"""
+        heap = Heap('d')
+        heap.push_many(x / 2 for x in range(300))
+        
+        assert heap.array.typecode == 'd'
+        self._verify_heap_property(heap)
+        assert heap.peek() == 149.5
+    
+    def test_pop_n(self):
+        """pop_n 이 큰 값부터 k 개를 꺼내는지 테스트"""
+        heap = Heap.from_iterable([4, 9, 1, 7, 3, 8])
+        
+        assert heap.pop_n(3) == [9, 8, 7]
+        assert heap.last_index == 3
+        self._verify_heap_property(heap)
+        assert heap.pop_n(10) == [4, 3, 1]
+        assert heap.pop_n(1) == []
+        assert heap.array[1] is None
+    
+    def test_pushpop(self):
+        """pushpop 테스트 - 넣은 값이 가장 크면 그대로 돌려받는다"""
+        heap = Heap.from_iterable([5, 3, 8])
+        
+        assert heap.pushpop(10) == 10
+        assert heap.last_index == 3
+        assert heap.pushpop(4) == 8
+        assert heap.pop_n(3) == [5, 4, 3]
+        assert Heap().pushpop(1) == 1
+    
+    def test_replace(self):
+        """replace 테스트 - 넣은 값과 상관없이 기존 최대값을 돌려받는다"""
+        heap = Heap.from_iterable([5, 3, 8])
+        
+        assert heap.replace(10) == 8
+        assert heap.last_index == 3
+        assert heap.replace(1) == 10
+        assert heap.pop_n(3) == [5, 3, 1]
+        
+        empty = Heap()
+        assert empty.replace(7) is None
+        assert empty.peek() == 7
+    
+    def test_top_k(self):
+        """top_k 가 가장 큰 k 개를 큰 순서대로 반환하는지 테스트"""
+        import random
+        values = [random.randint(0, 10000) for _ in range(5000)]
+        
+        assert top_k(values, 10) == sorted(values, reverse=True)[:10]
+        assert top_k(iter(values), 1) == [max(values)]
+    
+    def test_top_k_edge_cases(self):
+        """k 가 0 이거나 데이터보다 큰 경우 테스트"""
+        assert top_k([3, 1, 2], 0) == []
+        assert top_k([3, 1, 2], 10) == [3, 2, 1]
+        assert top_k([], 5) == []
+    
+    def test_top_k_with_key_is_stable(self):
+        """key 가 같으면 먼저 나온 원소가 남고 앞에 오는지 테스트 (sorted 와 같은 결과)"""
+        events = [("a", 3), ("b", 5), ("c", 3), ("d", 1), ("e", 5), ("f", 3), ("g", 3)]
+        by_score = lambda event: event[1]
+        
+        for k in range(len(events) + 1):
+            assert top_k(events, k, key=by_score) == sorted(events, key=by_score, reverse=True)[:k]
+    
+    def _verify_heap_property(self, heap):
+        """heap property가 유지되는지 확인하는 헬퍼 메서드"""
+        for i in range(1, heap.last_index + 1):
+            for child in (2 * i, 2 * i + 1):
+                if child <= heap.last_index:
+                    assert heap.array[i] >= heap.array[child], \
+                        f"Heap property violated: parent {heap.array[i]} < child {heap.array[child]} at index {i}"
+
+class TestDaryHeap:
+    """DaryHeap 이 arity 와 상관없이 Heap 과 같은 결과를 내는지 테스트하는 클래스"""
+    
+    @pytest.mark.parametrize("arity", [2, 3, 4, 8])
+    def test_insert_and_delete_root(self, arity):
+        """삽입 후 delete_root 가 내림차순으로 나오는지 테스트"""
+        import random
+        values = [random.randint(-1000, 1000) for _ in range(500)]
+        heap = DaryHeap(arity)
+        for value in values:
+            heap.insert(value)
+        
+        self._verify_heap_property(heap)
+        assert [heap.delete_root() for _ in values] == sorted(values, reverse=True)
+        assert heap.delete_root() is None
+    
+    @pytest.mark.parametrize("arity", [2, 4, 8])
+    def test_delete_middle_node(self, arity):
+        """중간 인덱스 삭제 후 힙 속성이 유지되는지 테스트"""
+        import random
+        rng = random.Random(arity)
+        heap = DaryHeap.from_iterable([rng.randint(0, 100) for _ in range(200)], arity=arity)
+        
+        while heap.last_index > 0:
+            assert heap.delete(rng.randint(1, heap.last_index)) == True
+            self._verify_heap_property(heap)
+        assert heap.delete(1) == False
+    
+    @pytest.mark.parametrize("arity", [2, 4, 8])
+    def test_from_iterable_and_bulk_operations(self, arity):
+        """from_iterable / push_many / pop_n / pushpop / replace 가 d-ary 에서도 동작하는지 테스트"""
+        heap = DaryHeap.from_iterable(range(100), arity=arity)
+        assert heap.arity == arity
+        self._verify_heap_property(heap)
+        
+        heap.push_many(range(100, 1000))
+        self._verify_heap_property(heap)
+        assert heap.pop_n(3) == [999, 998, 997]
+        assert heap.pushpop(5000) == 5000
+        assert heap.replace(-1) == 996
+        self._verify_heap_property(heap)
+    
+    def test_binary_layout_matches_heap(self):
+        """arity=2 이면 Heap 과 똑같은 배열 배치가 되는지 테스트"""
+        values = [10, 20, 15, 30, 25, 12, 8, 35]
+        heap = Heap()
+        dary = DaryHeap(2)
+        for value in values:
+            heap.insert(value)
+            dary.insert(value)
+        
+        assert dary.array[:dary.last_index + 1] == heap.array[:heap.last_index + 1]
+    
+    def test_typed_array_storage(self):
+        """typed array 저장소 테스트"""
+        heap = DaryHeap(4, 'q')
+        for value in range(300):
+            heap.insert(value)
+        
+        assert heap.array.typecode == 'q'
+        assert heap.pop_n(2) == [299, 298]
+    
+    def test_invalid_arity(self):
+        """arity 가 2 보다 작으면 ValueError"""
+        with pytest.raises(ValueError):
+            DaryHeap(1)
+    
+    def _verify_heap_property(self, heap):
+        """모든 노드가 자기 자식들보다 크거나 같은지 확인하는 헬퍼 메서드"""
+        for child in range(2, heap.last_index + 1):
+            parent = (child - 2) // heap.arity + 1
+            assert heap.array[parent] >= heap.array[child], \
+                f"Heap property violated: parent {heap.array[parent]} < child {heap.array[child]} at index {child}"
+
 if __name__ == "__main__":
     # 직접 실행할 때의 테스트
     print("Heap delete 테스트 실행 중...")
@@ -0,0 +1,445 @@
+import asyncio
+import multiprocessing
+import pickle
+import random
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from queue import (
+    MIN_CAPACITY,
+    AsyncQueue,
+    BlockingQueue,
+    Deque,
+    Empty,
+    Full,
+    Queue,
+    SharedMemoryQueue,
+    sliding_window_max,
+    sliding_window_min,
+)
+
+
+class TestRingBufferQueue:
+    """Tests for the circular-buffer Queue"""
+
+    def test_fifo_order(self):
+        queue = Queue()
+        for ele in range(25):
+            queue.enqueue(ele)
+        assert len(queue) == 25
+        assert [queue.dequeue() for _ in range(25)] == list(range(25))
+        assert len(queue) == 0
+
+    def test_dequeue_empty_returns_none(self):
+        queue = Queue()
+        assert queue.dequeue() is None
+        queue.enqueue(1)
+        queue.dequeue()
+        assert queue.dequeue() is None
+
+    def test_wraparound_reuses_slots(self):
+        queue = Queue()
+        for ele in range(7):
+            queue.enqueue(ele)
+        for ele in range(5):
+            assert queue.dequeue() == ele
+        for ele in range(7, 14):
+            queue.enqueue(ele)
+        # nine elements fit in the original ten slots: back has wrapped to the start
+        assert len(queue.arr) == MIN_CAPACITY
+        assert queue.back < queue.front
+        assert [queue.dequeue() for _ in range(9)] == list(range(5, 14))
+
+    def test_grow_while_wrapped(self):
+        queue = Queue()
+        for ele in range(8):
+            queue.enqueue(ele)
+        for ele in range(6):
+            queue.dequeue()
+        for ele in range(8, 30):
+            queue.enqueue(ele)
+        assert len(queue.arr) >= 24
+        assert [queue.dequeue() for _ in range(24)] == list(range(6, 30))
+
+    def test_shrinks_when_drained(self):
+        queue = Queue()
+        for ele in range(10_000):
+            queue.enqueue(ele)
+        assert len(queue.arr) >= 10_000
+        for ele in range(9_990):
+            assert queue.dequeue() == ele
+        assert len(queue.arr) <= 4 * MIN_CAPACITY
+        assert [queue.dequeue() for _ in range(10)] == list(range(9_990, 10_000))
+        assert len(queue.arr) == MIN_CAPACITY
+
+    def test_steady_depth_keeps_capacity(self):
+        queue = Queue()
+        for ele in range(10):
+            queue.enqueue(ele)
+        for ele in range(10, 100_000):
+            queue.enqueue(ele)
+            assert queue.dequeue() == ele - 10
+        assert len(queue.arr) <= 2 * MIN_CAPACITY
+
+    def test_dequeued_slots_release_references(self):
+        queue = Queue()
+        queue.enqueue(object())
+        queue.dequeue()
+        assert queue.arr == [None] * len(queue.arr)
+
+    def test_matches_deque(self):
+        rng = random.Random(0)
+        queue, expected = Queue(), deque()
+        for _ in range(20_000):
+            if rng.random() < 0.55:
+                ele = rng.random()
+                queue.enqueue(ele)
+                expected.append(ele)
+            else:
+                assert queue.dequeue() == (expected.popleft() if expected else None)
+            assert len(queue) == len(expected)
+
+
+class TestQueueBatches:
+    """Tests for enqueue_many / dequeue_many"""
+
+    def test_round_trip(self):
+        queue = Queue()
+        queue.enqueue_many(range(100))
+        assert len(queue) == 100
+        assert queue.dequeue_many(30) == list(range(30))
+        assert queue.dequeue_many(1000) == list(range(30, 100))
+        assert queue.dequeue_many(5) == []
+        assert queue.dequeue_many(0) == []
+
+    def test_runs_that_wrap(self):
+        queue = Queue()
+        queue.enqueue_many(range(8))
+        assert queue.dequeue_many(6) == list(range(6))
+        queue.enqueue_many([8, 9, 10, 11, 12])
+        # the run filled slots 8 and 9, then wrapped to slots 0 to 2
+        assert len(queue.arr) == MIN_CAPACITY
+        assert queue.arr[:3] == [10, 11, 12]
+        assert queue.dequeue_many(7) == list(range(6, 13))
+        assert queue.arr == [None] * MIN_CAPACITY
+
+    def test_grow_and_shrink(self):
+        queue = Queue()
+        queue.enqueue(-1)
+        queue.enqueue_many(range(10_000))
+        assert len(queue.arr) >= 10_001
+        assert queue.dequeue() == -1
+        assert queue.dequeue_many(9_995) == list(range(9_995))
+        assert len(queue.arr) <= 4 * MIN_CAPACITY
+        assert queue.dequeue_many(10) == list(range(9_995, 10_000))
+
+    def test_mixed_with_single_operations(self):
+        rng = random.Random(1)
+        queue, expected = Queue(), deque()
+        for _ in range(5_000):
+            choice = rng.random()
+            if choice < 0.3:
+                eles = [rng.random() for _ in range(rng.randint(0, 40))]
+                queue.enqueue_many(iter(eles))
+                expected.extend(eles)
+            elif choice < 0.6:
+                n = rng.randint(0, 45)
+                assert queue.dequeue_many(n) == [expected.popleft() for _ in range(min(n, len(expected)))]
+            elif choice < 0.8:
+                ele = rng.random()
+                queue.enqueue(ele)
+                expected.append(ele)
+            else:
+                assert queue.dequeue() == (expected.popleft() if expected else None)
+            assert len(queue) == len(expected)
+
+
+class TestDeque:
+    """Tests for the double-ended ring buffer and the sliding-window helpers"""
+
+    def test_both_ends(self):
+        deque_ = Deque()
+        deque_.push_back(2)
+        deque_.push_front(1)
+        deque_.push_back(3)
+        deque_.push_front(0)
+        assert [deque_[i] for i in range(4)] == [0, 1, 2, 3]
+        assert deque_.pop_back() == 3
+        assert deque_.pop_front() == 0
+        assert len(deque_) == 2
+        assert deque_.pop_back() == 2
+        assert deque_.pop_back() == 1
+        assert deque_.pop_back() is None
+        assert deque_.pop_front() is None
+
+    def test_push_front_wraps_and_grows(self):
+        deque_ = Deque()
+        for ele in range(25):
+            deque_.push_front(ele)
+        assert len(deque_.arr) >= 25
+        assert [deque_[i] for i in range(25)] == list(range(24, -1, -1))
+        assert [deque_.pop_back() for _ in range(25)] == list(range(25))
+        assert len(deque_.arr) == MIN_CAPACITY
+
+    def test_indexing(self):
+        deque_ = Deque()
+        for ele in range(8):
+            deque_.push_back(ele)
+        for _ in range(5):
+            deque_.pop_front()
+        for ele in range(8, 13):
+            deque_.push_back(ele)
+        # the contents wrap around the end of arr
+        assert deque_.back < deque_.front
+        assert [deque_[i] for i in range(len(deque_))] == list(range(5, 13))
+        assert deque_[-1] == 12
+        assert deque_[-8] == 5
+        with pytest.raises(IndexError):
+            deque_[8]
+        with pytest.raises(IndexError):
+            deque_[-9]
+        with pytest.raises(IndexError):
+            Deque()[0]
+
+    def test_matches_collections_deque(self):
+        rng = random.Random(2)
+        deque_, expected = Deque(), deque()
+        for _ in range(20_000):
+            choice = rng.randrange(4)
+            if choice == 0:
+                ele = rng.random()
+                deque_.push_back(ele)
+                expected.append(ele)
+            elif choice == 1:
+                ele = rng.random()
+                deque_.push_front(ele)
+                expected.appendleft(ele)
+            elif choice == 2:
+                assert deque_.pop_back() == (expected.pop() if expected else None)
+            else:
+                assert deque_.pop_front() == (expected.popleft() if expected else None)
+            assert len(deque_) == len(expected)
+            if expected:
+                assert deque_[0] == expected[0] and deque_[-1] == expected[-1]
+
+    def test_sliding_window(self):
+        values = [1, 3, -1, -3, 5, 3, 6, 7]
+        assert list(sliding_window_max(values, 3)) == [3, 3, 5, 5, 6, 7]
+        assert list(sliding_window_min(values, 3)) == [-1, -3, -3, -3, 3, 3]
+        assert list(sliding_window_max(values, 1)) == values
+        assert list(sliding_window_max(values, 9)) == []
+        assert list(sliding_window_min([], 2)) == []
+        with pytest.raises(ValueError):
+            sliding_window_max(values, 0)
+
+    def test_sliding_window_matches_brute_force(self):
+        rng = random.Random(3)
+        values = [rng.randint(0, 20) for _ in range(500)]
+        for width in (1, 2, 5, 17, 500):
+            windows = [values[i:i + width] for i in range(len(values) - width + 1)]
+            assert list(sliding_window_max(iter(values), width)) == [max(window) for window in windows]
+            assert list(sliding_window_min(iter(values), width)) == [min(window) for window in windows]
+
+
+class TestBlockingQueue:
+    """Tests for the thread-safe bounded queue"""
+
+    def test_fifo_without_waiting(self):
+        queue = BlockingQueue(maxsize=3)
+        for ele in range(3):
+            queue.put(ele)
+        assert len(queue) == 3
+        assert [queue.get() for _ in range(3)] == [0, 1, 2]
+
+    def test_timeouts(self):
+        queue = BlockingQueue(maxsize=1)
+        with pytest.raises(Empty):
+            queue.get(timeout=0)
+        queue.put("a")
+        start = time.perf_counter()
+        with pytest.raises(Full):
+            queue.put("b", timeout=0.05)
+        assert time.perf_counter() - start >= 0.04
+        assert queue.get(timeout=0) == "a"
+
+    def test_unbounded(self):
+        queue = BlockingQueue()
+        for ele in range(1000):
+            queue.put(ele, timeout=0)
+        assert len(queue) == 1000
+
+    def test_producer_gets_backpressure(self):
+        queue = BlockingQueue(maxsize=4)
+        high_water = []
+
+        def produce():
+            for ele in range(2000):
+                queue.put(ele)
+                high_water.append(len(queue))
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = [queue.get(timeout=5) for _ in range(2000)]
+        producer.join()
+        assert received == list(range(2000))
+        assert max(high_water) <= 4
+
+    def test_many_producers_and_consumers(self):
+        queue = BlockingQueue(maxsize=8)
+        received = []
+        lock = threading.Lock()
+
+        def produce(offset):
+            for ele in range(500):
+                queue.put(offset + ele)
+
+        def consume():
+            while True:
+                ele = queue.get(timeout=5)
+                if ele is None:
+                    return
+                with lock:
+                    received.append(ele)
+
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        producers = [threading.Thread(target=produce, args=(offset * 1000,)) for offset in range(4)]
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        for _ in consumers:
+            queue.put(None)
+        for thread in consumers:
+            thread.join()
+        assert sorted(received) == [offset * 1000 + ele for offset in range(4) for ele in range(500)]
+
+
+class TestAsyncQueue:
+    """Tests for the asyncio bounded queue"""
+
+    def test_producer_and_consumer(self):
+        async def main():
+            queue = AsyncQueue(maxsize=2)
+            high_water = []
+
+            async def produce():
+                for ele in range(100):
+                    await queue.put(ele)
+                    high_water.append(len(queue))
+
+            producer = asyncio.create_task(produce())
+            received = [await queue.get() for _ in range(100)]
+            await producer
+            return received, max(high_water)
+
+        received, high_water = asyncio.run(main())
+        assert received == list(range(100))
+        assert high_water <= 2
+
+    def test_timeouts(self):
+        async def main():
+            queue = AsyncQueue(maxsize=1)
+            with pytest.raises(Empty):
+                await queue.get(timeout=0.01)
+            await queue.put("a", timeout=0)
+            with pytest.raises(Full):
+                await queue.put("b", timeout=0.01)
+            assert await queue.get(timeout=0) == "a"
+            assert len(queue) == 0
+
+        asyncio.run(main())
+
+
+def produce_records(queue, n):
+    for i in range(n):
+        queue.put((i, i * 0.5), timeout=10)
+    queue.close()
+
+
+def produce_batches(queue, n):
+    records = [(i, i * 0.5) for i in range(n)]
+    while records:
+        written = queue.put_many(records[:100])
+        records = records[written:]
+    queue.close()
+
+
+class TestSharedMemoryQueue:
+    """Tests for the shared-memory single-producer, single-consumer queue"""
+
+    def make_queue(self, capacity=8):
+        queue = SharedMemoryQueue("<qd", capacity)
+        self.queues.append(queue)
+        return queue
+
+    def setup_method(self):
+        self.queues = []
+
+    def teardown_method(self):
+        for queue in self.queues:
+            queue.close()
+            queue.unlink()
+
+    def test_put_get_and_wraparound(self):
+        queue = self.make_queue(capacity=4)
+        assert queue.try_get() is None
+        for i in range(4):
+            assert queue.try_put((i, float(i)))
+        assert not queue.try_put((4, 4.0))
+        assert len(queue) == 4
+        for round_number in range(10):
+            assert queue.try_get() == (round_number, float(round_number))
+            assert queue.try_put((round_number + 4, float(round_number + 4)))
+        assert [queue.try_get() for _ in range(4)] == [(i, float(i)) for i in range(10, 14)]
+        assert len(queue) == 0
+
+    def test_batches_that_wrap(self):
+        queue = self.make_queue(capacity=8)
+        assert queue.put_many([(i, 0.0) for i in range(6)]) == 6
+        assert queue.get_many(5) == [(i, 0.0) for i in range(5)]
+        assert queue.put_many([(i, 1.0) for i in range(10)]) == 7
+        assert queue.get_many(100) == [(5, 0.0)] + [(i, 1.0) for i in range(7)]
+        assert queue.get_many(3) == []
+        assert queue.put_many([]) == 0
+
+    def test_timeouts(self):
+        queue = self.make_queue(capacity=1)
+        with pytest.raises(Empty):
+            queue.get(timeout=0.01)
+        queue.put((1, 1.0), timeout=0)
+        with pytest.raises(Full):
+            queue.put((2, 2.0), timeout=0.01)
+        assert queue.get(timeout=0) == (1, 1.0)
+
+    def test_attach_and_pickle(self):
+        queue = self.make_queue()
+        queue.try_put((7, 3.5))
+        other = SharedMemoryQueue.attach(queue.name)
+        assert other.capacity == 8 and other.record.format == "<qd"
+        assert other.try_get() == (7, 3.5)
+        copy = pickle.loads(pickle.dumps(queue))
+        copy.try_put((8, 4.0))
+        assert queue.try_get() == (8, 4.0)
+        other.close()
+        copy.close()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SharedMemoryQueue("<qd", 0)
+        with pytest.raises(ValueError):
+            SharedMemoryQueue("<" + "q" * 40, 4)
+
+    @pytest.mark.parametrize("producer", [produce_records, produce_batches])
+    def test_between_processes(self, producer):
+        queue = self.make_queue(capacity=64)
+        process = multiprocessing.get_context().Process(target=producer, args=(queue, 5000))
+        process.start()
+        received = []
+        while len(received) < 5000:
+            received.extend(queue.get_many(50) or [queue.get(timeout=10)])
+        process.join(timeout=10)
+        assert process.exitcode == 0
+        assert received == [(i, i * 0.5) for i in range(5000)]
@@ -1,5 +1,10 @@
+import gc
+import os
+import random
+import tempfile
+import threading
 import unittest
-from trie import Trie, TrieNode, trieSearch
+from trie import AhoCorasick, ConcurrentTrie, FrozenTrie, RadixTrie, Trie, TrieNode, trie_search_many, trieSearch
 
 
 class TestTrieSearch(unittest.TestCase):
@@ -211,6 +216,636 @@ class TestTrieSearch(unittest.TestCase):
         self.assertFalse(trieSearch(self.trie, "resume"))
 
 
+class TestCompactTrie(unittest.TestCase):
+    """Test cases for slotted nodes and the frozen trie"""
+
+    def setUp(self):
+        self.words = ["cat", "car", "card", "care", "careful", "cars", "carry",
+                      "dog", "café", "한글", "🚀", "a" * 100]
+        self.trie = Trie()
+        for word in self.words:
+            self.trie.insert(word)
+
+    def test_leaf_nodes_have_no_children(self):
+        """Test that children are only allocated once a node has a child"""
+        self.assertIsNone(TrieNode().children)
+        node = self.trie.root
+        for char in "careful":
+            node = node.children[char]
+        self.assertIsNone(node.children)
+        self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_frozen_search_matches_trie(self):
+        """Test that trieSearch gives the same answers on a frozen trie"""
+        frozen = self.trie.freeze()
+        self.assertIsInstance(frozen, FrozenTrie)
+        self.assertEqual(len(frozen), len(set(self.words)))
+        probes = self.words + ["", "c", "ca", "cards", "carefully", "do", "cafe", "한", "a" * 99, "zzz"]
+        for word in probes:
+            self.assertEqual(trieSearch(frozen, word), trieSearch(self.trie, word), word)
+
+    def test_frozen_layout(self):
+        """Test the breadth-first edge layout: edge e leads to node e + 1"""
+        trie = Trie()
+        for word in ["ab", "b"]:
+            trie.insert(word)
+        frozen = trie.freeze()
+        self.assertEqual(list(frozen.labels), [ord("a"), ord("b"), ord("b")])
+        self.assertEqual(list(frozen.first), [0, 2, 3, 3, 3])
+        self.assertEqual(list(frozen.entries), [0, 0, 1, 1])
+        self.assertEqual(frozen.child(0, "b"), 2)
+        self.assertEqual(frozen.child(1, "b"), 3)
+        self.assertEqual(frozen.child(0, "c"), -1)
+
+    def test_frozen_empty_trie(self):
+        """Test freezing an empty trie and a trie holding only the empty word"""
+        frozen = Trie().freeze()
+        self.assertEqual(len(frozen), 0)
+        self.assertFalse(trieSearch(frozen, ""))
+        self.assertFalse(trieSearch(frozen, "a"))
+
+        trie = Trie()
+        trie.root.is_entry = True
+        self.assertTrue(trieSearch(trie.freeze(), ""))
+
+    def test_frozen_copy_is_independent(self):
+        """Test that later inserts do not change an existing frozen copy"""
+        frozen = self.trie.freeze()
+        self.trie.insert("zebra")
+        self.assertTrue(trieSearch(self.trie, "zebra"))
+        self.assertFalse(trieSearch(frozen, "zebra"))
+
+
+class TestRadixTrie(unittest.TestCase):
+    """Test cases for the path-compressed radix trie"""
+
+    def count_nodes(self, node):
+        return 1 + sum(self.count_nodes(child) for child in (node.children or {}).values())
+
+    def test_matches_plain_trie(self):
+        """Test that the radix trie answers exactly like the plain trie"""
+        words = ["cat", "car", "card", "care", "careful", "cars", "carry",
+                 "test", "testing", "tester", "c", "café", "한글", "🚀"]
+        plain, radix = Trie(), RadixTrie()
+        for word in words:
+            plain.insert(word)
+            radix.insert(word)
+        probes = words + ["", "ca", "carr", "careless", "tes", "testings", "x", "cafe"]
+        for word in probes:
+            self.assertEqual(trieSearch(radix, word), trieSearch(plain, word), word)
+
+    def test_edge_split(self):
+        """Test that inserting a diverging word splits the edge at the common prefix"""
+        radix = RadixTrie()
+        radix.insert("testing")
+        self.assertEqual(radix.root.children["t"].label, "testing")
+
+        radix.insert("tester")
+        middle = radix.root.children["t"]
+        self.assertEqual(middle.label, "test")
+        self.assertFalse(middle.is_entry)
+        self.assertEqual(sorted(child.label for child in middle.children.values()), ["er", "ing"])
+
+        radix.insert("test")
+        self.assertTrue(middle.is_entry)
+        self.assertTrue(trieSearch(radix, "test"))
+        self.assertFalse(trieSearch(radix, "tes"))
+
+    def test_prefix_of_existing_label(self):
+        """Test inserting a word that ends in the middle of an edge label"""
+        radix = RadixTrie()
+        radix.insert("https://example.com/a")
+        radix.insert("https://example")
+        self.assertTrue(trieSearch(radix, "https://example"))
+        self.assertTrue(trieSearch(radix, "https://example.com/a"))
+        self.assertFalse(trieSearch(radix, "https://example.com"))
+        self.assertEqual(self.count_nodes(radix.root), 3)
+
+    def test_empty_word(self):
+        """Test the empty word in a radix trie"""
+        radix = RadixTrie()
+        self.assertFalse(trieSearch(radix, ""))
+        radix.insert("")
+        self.assertTrue(trieSearch(radix, ""))
+
+    def test_long_keys_use_few_nodes(self):
+        """Test that long keys with few branch points collapse into few nodes"""
+        urls = [f"https://example.com/api/v1/users/{i}/profile" for i in range(100)]
+        radix = RadixTrie()
+        for url in urls:
+            radix.insert(url)
+        for url in urls:
+            self.assertTrue(trieSearch(radix, url))
+        self.assertFalse(trieSearch(radix, "https://example.com/api/v1/users/"))
+        self.assertLess(self.count_nodes(radix.root), 2 * len(urls) + 2)
+
+
+class TestTrieCompletion(unittest.TestCase):
+    """Test cases for starts_with and complete"""
+
+    def setUp(self):
+        self.trie = Trie()
+        self.weights = {"car": 5, "cat": 9, "care": 5, "cart": 1, "careful": 3, "dog": 7, "do": 2}
+        for word, weight in self.weights.items():
+            self.trie.insert(word, weight)
+
+    def test_starts_with_sorted(self):
+        """Test that starts_with yields every word under the prefix in sorted order"""
+        self.assertEqual(list(self.trie.starts_with("car")), ["car", "care", "careful", "cart"])
+        self.assertEqual(list(self.trie.starts_with("")), sorted(self.weights))
+        self.assertEqual(list(self.trie.starts_with("x")), [])
+        self.assertEqual(list(self.trie.starts_with("cats")), [])
+
+    def test_starts_with_is_lazy(self):
+        """Test that starts_with is a generator that can stop early"""
+        words = self.trie.starts_with("c")
+        self.assertEqual(next(words), "car")
+        self.assertEqual(next(words), "care")
+
+    def test_complete_order(self):
+        """Test that complete returns the highest weights first, ties in sorted order"""
+        self.assertEqual(self.trie.complete("ca", 3), [("cat", 9), ("car", 5), ("care", 5)])
+        self.assertEqual(self.trie.complete("do", 5), [("dog", 7), ("do", 2)])
+        self.assertEqual(self.trie.complete("q", 5), [])
+        self.assertEqual(self.trie.complete("ca", 0), [])
+
+    def test_complete_after_lowering_weight(self):
+        """Test that re-inserting a word with a lower weight updates the cached maximum"""
+        self.trie.insert("cat", 0)
+        self.assertEqual(self.trie.root.best, 7)
+        self.assertEqual(self.trie.complete("c", 2), [("car", 5), ("care", 5)])
+
+    def test_reinsert_without_weight_keeps_rank(self):
+        """Test that re-inserting words without a weight leaves their ranks alone"""
+        for word in self.weights:
+            self.trie.insert(word)
+        self.trie.insert("cab")
+        self.assertEqual(self.trie.complete("ca", 3), [("cat", 9), ("car", 5), ("care", 5)])
+        self.assertEqual(self.trie.complete("cab", 1), [("cab", 0)])
+        self.assertEqual(len(self.trie), len(self.weights) + 1)
+        self.assertEqual(self.trie.root.best, 9)
+
+    def test_complete_matches_sorting(self):
+        """Test complete against sorting all words under the prefix"""
+        rng = random.Random(0)
+        trie, weights = Trie(), {}
+        for _ in range(2000):
+            word = "".join(rng.choices("abc", k=rng.randint(1, 7)))
+            weights[word] = rng.randint(0, 50)
+            trie.insert(word, weights[word])
+        for prefix in ["", "a", "ab", "cab", "bbb"]:
+            expected = sorted(
+                ((word, weight) for word, weight in weights.items() if word.startswith(prefix)),
+                key=lambda pair: (-pair[1], pair[0]),
+            )
+            self.assertEqual(trie.complete(prefix, 10), expected[:10], prefix)
+            self.assertEqual(list(trie.starts_with(prefix)), sorted(word for word, _ in expected))
+
+
+class TestTrieFromSorted(unittest.TestCase):
+    """Test cases for building a trie from sorted words"""
+
+    def test_matches_insert(self):
+        """Test that from_sorted builds the same trie as inserting one word at a time"""
+        rng = random.Random(0)
+        words = sorted({"".join(rng.choices("abcd", k=rng.randint(0, 6))) for _ in range(500)})
+        built = Trie.from_sorted(words)
+        inserted = Trie()
+        for word in words:
+            inserted.insert(word)
+        self.assertEqual(list(built.starts_with("")), list(inserted.starts_with("")))
+        for word in words + ["abcde", "dddddd", "aaaaaaa"]:
+            self.assertEqual(trieSearch(built, word), trieSearch(inserted, word), word)
+        self.assertEqual(built.complete("ab", 3), inserted.complete("ab", 3))
+
+    def test_cached_counts_and_weights(self):
+        """Test that every node gets the same count and best as an insert-built trie"""
+        rng = random.Random(1)
+        words = sorted({"".join(rng.choices("abc", k=rng.randint(0, 5))) for _ in range(200)})
+        inserted = Trie()
+        for word in words:
+            inserted.insert(word)
+        pending = [(Trie.from_sorted(words).root, inserted.root)]
+        while pending:
+            built, expected = pending.pop()
+            self.assertEqual((built.count, built.best), (expected.count, expected.best))
+            self.assertEqual(sorted(built.children or ()), sorted(expected.children or ()))
+            for char in built.children or ():
+                pending.append((built.children[char], expected.children[char]))
+        self.assertEqual(Trie.from_sorted([]).root.best, Trie().root.best)
+
+    def test_accepts_generator(self):
+        """Test building from a generator, the way a word file would be streamed"""
+        lines = iter(["apple\n", "applet\n", "apply\n", "banana\n"])
+        trie = Trie.from_sorted(line.rstrip("\n") for line in lines)
+        self.assertEqual(list(trie.starts_with("")), ["apple", "applet", "apply", "banana"])
+        self.assertFalse(trieSearch(trie, "appl"))
+
+    def test_duplicates_and_empty(self):
+        """Test that duplicates are skipped and empty input gives an empty trie"""
+        trie = Trie.from_sorted(["", "a", "a", "ab", "ab"])
+        self.assertEqual(list(trie.starts_with("")), ["", "a", "ab"])
+        self.assertFalse(trieSearch(Trie.from_sorted([]), ""))
+
+    def test_unsorted_input(self):
+        """Test that words out of order are rejected"""
+        with self.assertRaises(ValueError):
+            Trie.from_sorted(["b", "a"])
+        with self.assertRaises(ValueError):
+            Trie.from_sorted(["abc", "ab"])
+        with self.assertRaises(ValueError):
+            Trie.from_sorted(["a", ""])
+
+    def test_leaves_garbage_collector_alone_by_default(self):
+        """Test that a default build keeps the collector running while it reads words"""
+        def words():
+            for word in ["a", "b", "c"]:
+                states.append(gc.isenabled())
+                yield word
+
+        states = []
+        Trie.from_sorted(words())
+        self.assertEqual(states, [True, True, True])
+
+        states = []
+        self.assertEqual(len(Trie.from_sorted(words(), pause_gc=True)), 3)
+        self.assertEqual(states, [False, False, False])
+
+    def test_restores_garbage_collector(self):
+        """Test that pause_gc re-enables the collector after a build, even a failed one"""
+        self.assertTrue(gc.isenabled())
+        Trie.from_sorted(["a", "b"], pause_gc=True)
+        self.assertTrue(gc.isenabled())
+        with self.assertRaises(ValueError):
+            Trie.from_sorted(["b", "a"], pause_gc=True)
+        self.assertTrue(gc.isenabled())
+
+
+class TestFrozenTrieFile(unittest.TestCase):
+    """Test cases for saving a frozen trie and mapping it back in"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "words.trie")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that a loaded trie answers like the one that was saved"""
+        words = ["cat", "car", "card", "care", "dog", "café", "한글", "🚀", ""]
+        trie = Trie()
+        for word in words:
+            trie.insert(word)
+        trie.freeze().save(self.path)
+
+        loaded = FrozenTrie.load(self.path)
+        self.assertIsInstance(loaded.labels, memoryview)
+        self.assertEqual(len(loaded), len(words))
+        for word in words + ["ca", "cards", "do", "한", "x"]:
+            self.assertEqual(trieSearch(loaded, word), trieSearch(trie, word), word)
+        loaded.close()
+        self.assertEqual(len(loaded), 0)
+        self.assertFalse(trieSearch(loaded, "cat"))
+
+    def test_empty_trie(self):
+        """Test saving and loading an empty trie"""
+        Trie().freeze().save(self.path)
+        loaded = FrozenTrie.load(self.path)
+        self.assertEqual(len(loaded), 0)
+        self.assertFalse(trieSearch(loaded, ""))
+        loaded.close()
+
+    def test_rejects_foreign_and_truncated_files(self):
+        """Test that files that are not trie files, or are cut short, are rejected"""
+        with open(self.path, "wb") as f:
+            f.write(b"not a trie at all" * 10)
+        with self.assertRaises(ValueError):
+            FrozenTrie.load(self.path)
+
+        trie = Trie()
+        trie.insert("hello")
+        trie.freeze().save(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # cuts that are not a multiple of 4 used to fail inside memoryview.cast with TypeError
+        for damaged in [data[:-cut] for cut in (1, 4, 7, 9, 11)] + [data + b"\0"]:
+            with open(self.path, "wb") as f:
+                f.write(damaged)
+            with self.assertRaises(ValueError):
+                FrozenTrie.load(self.path)
+
+
+class TestTrieSearchMany(unittest.TestCase):
+    """Test cases for batched lookups"""
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.trie = Trie()
+        for _ in range(2000):
+            self.trie.insert("".join(rng.choices("abcd", k=rng.randint(1, 6))))
+        self.targets = ["".join(rng.choices("abcd", k=rng.randint(0, 7))) for _ in range(3000)]
+
+    def test_matches_trie_search(self):
+        """Test that every kind of trie gives trieSearch's answers in input order"""
+        expected = [trieSearch(self.trie, target) for target in self.targets]
+        self.assertEqual(trie_search_many(self.trie, self.targets), expected)
+        self.assertEqual(trie_search_many(self.trie.freeze(), self.targets), expected)
+
+        radix = RadixTrie()
+        for word in self.trie.starts_with(""):
+            radix.insert(word)
+        self.assertEqual(trie_search_many(radix, self.targets), expected)
+
+    def test_duplicates_and_prefixes(self):
+        """Test repeated targets and targets that are prefixes of one another"""
+        trie = Trie()
+        for word in ["car", "card", "cart"]:
+            trie.insert(word)
+        targets = ["card", "ca", "car", "card", "cards", "", "car", "dog", "c"]
+        self.assertEqual(
+            trie_search_many(trie, targets),
+            [True, False, True, True, False, False, True, False, False],
+        )
+
+    def test_empty_inputs(self):
+        """Test an empty batch, a missing trie and a generator of targets"""
+        self.assertEqual(trie_search_many(self.trie, []), [])
+        self.assertEqual(trie_search_many(None, ["a", "b"]), [False, False])
+        words = list(self.trie.starts_with("ab"))
+        self.assertEqual(trie_search_many(self.trie, (word for word in words)), [True] * len(words))
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+class TestTrieFuzzySearch(unittest.TestCase):
+    """Test cases for typo-tolerant search"""
+
+    def setUp(self):
+        self.trie = Trie()
+        for word in ["cat", "car", "card", "care", "careful", "cart", "dog", "cot"]:
+            self.trie.insert(word)
+
+    def test_exact_and_close_matches(self):
+        """Test matches within one and two edits, closest first"""
+        self.assertEqual(self.trie.fuzzy_search("cat", 0), [("cat", 0)])
+        self.assertEqual(
+            self.trie.fuzzy_search("cat", 1),
+            [("cat", 0), ("car", 1), ("cart", 1), ("cot", 1)],
+        )
+        self.assertEqual(self.trie.fuzzy_search("carful", 1), [("careful", 1)])
+        self.assertEqual(self.trie.fuzzy_search("xyz", 2), [])
+        self.assertEqual(self.trie.fuzzy_search("cat", -1), [])
+
+    def test_empty_word(self):
+        """Test the empty query and an entry for the empty word"""
+        self.assertEqual(self.trie.fuzzy_search("", 2), [])
+        self.assertEqual(self.trie.fuzzy_search("", 3), [("car", 3), ("cat", 3), ("cot", 3), ("dog", 3)])
+        self.trie.root.is_entry = True
+        self.assertEqual(self.trie.fuzzy_search("a", 1), [("", 1)])
+
+    def test_matches_brute_force(self):
+        """Test fuzzy_search against edit distance to every word"""
+        rng = random.Random(0)
+        words = {"".join(rng.choices("abc", k=rng.randint(1, 7))) for _ in range(500)}
+        trie = Trie()
+        for word in words:
+            trie.insert(word)
+        for query in ["abc", "aaaa", "cabbage", "b", "bcbcbcb"]:
+            for max_edits in range(3):
+                expected = sorted(
+                    ((word, levenshtein(query, word)) for word in words if levenshtein(query, word) <= max_edits),
+                    key=lambda match: (match[1], match[0]),
+                )
+                self.assertEqual(trie.fuzzy_search(query, max_edits), expected, (query, max_edits))
+
+
+class TestConcurrentTrie(unittest.TestCase):
+    """Test cases for the copy-on-write concurrent trie"""
+
+    def test_matches_plain_trie(self):
+        """Test that inserts and queries behave like the plain trie"""
+        words = {"car": 5, "cat": 9, "care": 5, "dog": 7, "": 1}
+        plain, concurrent = Trie(), ConcurrentTrie()
+        for word, weight in words.items():
+            plain.insert(word, weight)
+            concurrent.insert(word, weight)
+        concurrent.insert("cat", 0)
+        plain.insert("cat", 0)
+        for word in list(words) + ["ca", "cars", "do"]:
+            self.assertEqual(trieSearch(concurrent, word), trieSearch(plain, word), word)
+        self.assertEqual(list(concurrent.starts_with("")), list(plain.starts_with("")))
+        self.assertEqual(concurrent.complete("", 3), plain.complete("", 3))
+
+    def test_reinsert_without_weight_keeps_rank(self):
+        """Test that re-inserting a word without a weight keeps its rank and the current root"""
+        trie = ConcurrentTrie()
+        trie.insert("cat", 9)
+        trie.insert("car", 5)
+        root = trie.root
+        trie.insert("cat")
+        self.assertIs(trie.root, root)
+        trie.insert("cab")
+        self.assertEqual(trie.complete("ca", 3), [("cat", 9), ("car", 5), ("cab", 0)])
+
+    def test_readers_keep_their_snapshot(self):
+        """Test that an insert never changes nodes reachable from an older root"""
+        trie = ConcurrentTrie()
+        for word in ["car", "card"]:
+            trie.insert(word)
+        snapshot = Trie(trie.root)
+        trie.insert("care")
+        trie.insert("ca")
+        self.assertFalse(trieSearch(snapshot, "care"))
+        self.assertFalse(trieSearch(snapshot, "ca"))
+        self.assertEqual(list(snapshot.starts_with("")), ["car", "card"])
+        self.assertEqual(list(trie.starts_with("")), ["ca", "car", "card", "care"])
+
+    def test_concurrent_readers_and_writers(self):
+        """Stress test: readers always see every committed word while writers insert"""
+        base = [f"base{i}" for i in range(200)]
+        trie = ConcurrentTrie()
+        for word in base:
+            trie.insert(word)
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                for word in base:
+                    if not trieSearch(trie, word):
+                        errors.append(word)
+
+        def write(offset):
+            for i in range(300):
+                trie.insert(f"new{offset}-{i}")
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(3)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        found = trie_search_many(trie, [f"new{offset}-{i}" for offset in range(3) for i in range(300)])
+        self.assertTrue(all(found))
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test cases for the multi-pattern matcher"""
+
+    def make_matcher(self, words):
+        trie = Trie()
+        for word in words:
+            trie.insert(word)
+        return AhoCorasick(trie)
+
+    def naive(self, words, text):
+        return sorted(
+            (start, word) for word in set(words) if word
+            for start in range(len(text)) if text.startswith(word, start)
+        )
+
+    def test_classic_example(self):
+        """Test overlapping matches, including words inside other words"""
+        matcher = self.make_matcher(["he", "she", "his", "hers"])
+        self.assertEqual(sorted(matcher.find("ushers")), [(1, "she"), (2, "he"), (2, "hers")])
+        self.assertEqual(list(matcher.find("")), [])
+        self.assertEqual(list(matcher.find("xyz")), [])
+
+    def test_matches_naive_search(self):
+        """Test the matcher against checking every position of the text"""
+        rng = random.Random(0)
+        words = ["".join(rng.choices("ab", k=rng.randint(1, 5))) for _ in range(40)] + [""]
+        matcher = self.make_matcher(words)
+        text = "".join(rng.choices("abc", k=2000))
+        self.assertEqual(sorted(matcher.find(text)), self.naive(words, text))
+
+    def test_chunked_stream(self):
+        """Test that matches straddling chunk boundaries are found with stream positions"""
+        words = ["needle", "needles", "dle", "한글"]
+        matcher = self.make_matcher(words)
+        text = "haystack needles and 한글 needle"
+        expected = self.naive(words, text)
+        for size in (1, 2, 3, 7):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.assertEqual(sorted(matcher.scan(chunks)), expected, size)
+
+    def test_byte_chunks(self):
+        """Test byte chunks, with a multi-byte character split between chunks"""
+        matcher = self.make_matcher(["café", "é"])
+        data = "un café".encode("utf-8")
+        chunks = [data[:6], data[6:7], data[7:]]
+        self.assertEqual(sorted(matcher.scan(chunks)), [(3, "café"), (6, "é")])
+
+
+class TestTrieDelete(unittest.TestCase):
+    """Test cases for delete, len and count_prefix"""
+
+    def setUp(self):
+        self.trie = Trie()
+        for word, weight in [("car", 5), ("card", 2), ("care", 8), ("cat", 1), ("dog", 3)]:
+            self.trie.insert(word, weight)
+
+    def test_delete_and_prune(self):
+        """Test that deleting removes the word and every node left without words"""
+        self.assertTrue(self.trie.delete("dog"))
+        self.assertFalse(trieSearch(self.trie, "dog"))
+        self.assertNotIn("d", self.trie.root.children)
+
+        self.assertTrue(self.trie.delete("car"))
+        self.assertFalse(trieSearch(self.trie, "car"))
+        self.assertTrue(trieSearch(self.trie, "card"))
+        self.assertTrue(trieSearch(self.trie, "care"))
+
+        self.assertTrue(self.trie.delete("card"))
+        node = self.trie.root.children["c"].children["a"].children["r"]
+        self.assertEqual(list(node.children), ["e"])
+
+    def test_delete_missing(self):
+        """Test deleting words that are absent or only prefixes"""
+        self.assertFalse(self.trie.delete("ca"))
+        self.assertFalse(self.trie.delete("cards"))
+        self.assertFalse(self.trie.delete("zebra"))
+        self.assertFalse(self.trie.delete(""))
+        self.assertEqual(len(self.trie), 5)
+
+    def test_delete_everything(self):
+        """Test that deleting every word leaves an empty root"""
+        for word in ["car", "card", "care", "cat", "dog"]:
+            self.assertTrue(self.trie.delete(word))
+        self.assertEqual(len(self.trie), 0)
+        self.assertIsNone(self.trie.root.children)
+        self.assertEqual(self.trie.complete("", 3), [])
+
+    def test_counts(self):
+        """Test len and count_prefix through inserts, repeats and deletes"""
+        self.assertEqual(len(self.trie), 5)
+        self.assertEqual(self.trie.count_prefix(""), 5)
+        self.assertEqual(self.trie.count_prefix("car"), 3)
+        self.assertEqual(self.trie.count_prefix("ca"), 4)
+        self.assertEqual(self.trie.count_prefix("x"), 0)
+
+        self.trie.insert("car", 7)
+        self.assertEqual(len(self.trie), 5)
+        self.trie.delete("card")
+        self.assertEqual(self.trie.count_prefix("car"), 2)
+        self.assertEqual(len(self.trie), 4)
+
+    def test_weights_after_delete(self):
+        """Test that complete forgets the weight of a deleted word"""
+        self.trie.delete("care")
+        self.assertEqual(self.trie.complete("ca", 2), [("car", 5), ("card", 2)])
+        self.assertEqual(self.trie.root.best, 5)
+
+    def test_from_sorted_counts(self):
+        """Test that from_sorted maintains the same counts as insert"""
+        words = sorted({"".join(random.Random(i).choices("abc", k=i % 6)) for i in range(300)})
+        built = Trie.from_sorted(words)
+        self.assertEqual(len(built), len(words))
+        for prefix in ["", "a", "ab", "cc", "abc"]:
+            self.assertEqual(built.count_prefix(prefix), sum(word.startswith(prefix) for word in words))
+
+    def test_churn_matches_set(self):
+        """Test random inserts and deletes against a set"""
+        rng = random.Random(1)
+        trie, words = Trie(), set()
+        for _ in range(3000):
+            word = "".join(rng.choices("ab", k=rng.randint(0, 5)))
+            if rng.random() < 0.5:
+                trie.insert(word)
+                words.add(word)
+            else:
+                self.assertEqual(trie.delete(word), word in words)
+                words.discard(word)
+        self.assertEqual(len(trie), len(words))
+        self.assertEqual(list(trie.starts_with("")), sorted(words))
+
+    def test_concurrent_delete_keeps_snapshot(self):
+        """Test that deleting from a ConcurrentTrie leaves older roots intact"""
+        trie = ConcurrentTrie()
+        for word in ["car", "card"]:
+            trie.insert(word)
+        snapshot = Trie(trie.root)
+        self.assertTrue(trie.delete("card"))
+        self.assertFalse(trie.delete("card"))
+        self.assertFalse(trieSearch(trie, "card"))
+        self.assertEqual(len(trie), 1)
+        self.assertTrue(trieSearch(snapshot, "card"))
+        self.assertEqual(len(snapshot), 2)
+
+
 def run_trie_search_demo():
     """Demonstration function showing trieSearch in action"""
     print("=== Trie Search Demo ===")
@@ -1,13 +1,39 @@
+from array import array
+from bisect import bisect_left
+import codecs
+from collections import deque
 from dataclasses import dataclass
+import gc
+from heapq import heappop, heappush
 from locale import currency
-from typing import Dict, Optional
+import mmap
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from mapped_arrays import load_arrays, release_arrays, save_arrays
+
+NO_WEIGHT = float("-inf")
+
+# On-disk FrozenTrie: header, then the arrays back to back in the order of _SAVED_ARRAYS.
+# All integers are little-endian.
+_MAGIC = b"TRIE"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIqqq")  # magic, version, nodes, edges, words
+_SAVED_ARRAYS = (("first", "I"), ("labels", "I"), ("entries", "B"))
 
 
-@dataclass
 class TrieNode:
+    # Most nodes in a dictionary trie are leaves, so children stay None until
+    # the first child is added and __slots__ drops the per-node __dict__.
+    __slots__ = ("is_entry", "children", "weight", "best", "count")
+
     def __init__(self, is_entry: bool = False) -> None:
         self.is_entry: bool = is_entry
-        self.children: Dict[str, 'TrieNode'] = {}
+        self.children: Optional[Dict[str, 'TrieNode']] = None
+        self.weight: float = 0  # rank of the word ending here, see Trie.complete
+        self.best: float = NO_WEIGHT  # highest weight of any word in this subtree
+        self.count: int = 0  # number of words in this subtree, this node included
 
 
 @dataclass
@@ -17,24 +43,629 @@ class Trie:
             root = TrieNode(is_entry=False)
         self.root: TrieNode = root
     
-    def insert(self, word: str) -> None:
-        """Insert a word into the trie."""
+    def insert(self, word: str, weight: Optional[float] = None) -> None:
+        """
+        Insert a word into the trie; weight ranks it in complete().
+
+        Without a weight a new word ranks 0 and a word already in the trie
+        keeps its weight, so reloading the same terms does not reset ranks.
+        """
+        current = self.root
+        path = [current]
+        for char in word:
+            if current.children is None:
+                current.children = {}
+            child = current.children.get(char)
+            if child is None:
+                child = current.children[char] = TrieNode()
+            current = child
+            path.append(current)
+        if current.is_entry:
+            if weight is None:
+                return
+            if weight < current.weight:
+                current.weight = weight
+                _recompute_best(path)
+                return
+        else:
+            if weight is None:
+                weight = 0
+            current.is_entry = True
+            for node in path:
+                node.count += 1
+        current.weight = weight
+        for node in path:
+            if node.best < weight:
+                node.best = weight
+
+    def delete(self, word: str) -> bool:
+        """Remove a word, pruning nodes left without words; False if it was absent."""
+        path = _path_to(self.root, word)
+        if path is None or not path[-1].is_entry:
+            return False
+        _remove_entry(path, word)
+        return True
+
+    def __len__(self) -> int:
+        return self.root.count
+
+    def count_prefix(self, prefix: str) -> int:
+        """Number of words beginning with prefix, read from the cached subtree counts."""
+        node = self._find(prefix)
+        return node.count if node else 0
+
+    @classmethod
+    def from_sorted(cls, words: Iterable[str], pause_gc: bool = False) -> 'Trie':
+        """
+        Build a trie from words in ascending order in one streaming pass.
+
+        Consecutive sorted words share their longest common prefix, so each
+        word starts from where it leaves the previous one, and every node
+        past that point is new and needs no lookup. words can be any
+        iterable, e.g. a generator over the lines of a large file.
+        Duplicates are skipped; words out of order raise ValueError.
+
+        By default this is no faster than calling insert() once per word.
+        Both allocate the same nodes and child dicts, and that allocation,
+        plus the cyclic garbage collector rescanning the growing trie over
+        and over, is nearly all of the build time; the skipped lookups do
+        not show next to it. pause_gc=True turns the collector off until
+        the build returns or raises, which is about three times faster.
+        That is process-wide: cyclic garbage created meanwhile by other
+        threads, or by the words iterable itself, is not collected until
+        the build ends. Only use it where that is acceptable, e.g. at
+        startup.
+        """
+        trie = cls()
+        path = [trie.root]  # path[i] is the node for previous[:i]
+        append = path.append
+        previous = ""
+        collecting = pause_gc and gc.isenabled()
+        if collecting:
+            gc.disable()
+        try:
+            for word in words:
+                if word <= previous:
+                    if word != previous:
+                        raise ValueError(f"words are not sorted: {word!r} after {previous!r}")
+                    if path[-1].is_entry:
+                        continue
+                common = 0
+                limit = min(len(word), len(previous))
+                while common < limit and word[common] == previous[common]:
+                    common += 1
+                if common + 1 < len(path):
+                    _fold_counts(path, common)
+                node = path[-1]
+                if common < len(word):
+                    # only the first new node can hang off an existing one; below it every node is fresh
+                    child = TrieNode()
+                    if node.children is None:
+                        node.children = {word[common]: child}
+                    else:
+                        node.children[word[common]] = child
+                    append(child)
+                    node = child
+                    for char in word[common + 1:]:
+                        child = TrieNode()
+                        node.children = {char: child}
+                        append(child)
+                        node = child
+                node.is_entry = True
+                node.count = 1
+                previous = word
+            _fold_counts(path, 0)
+            if trie.root.count:
+                trie.root.best = 0
+        finally:
+            if collecting:
+                gc.enable()
+        return trie
+
+    def _find(self, prefix: str) -> Optional[TrieNode]:
         current = self.root
+        for char in prefix:
+            if not current.children:
+                return None
+            current = current.children.get(char)
+            if current is None:
+                return None
+        return current
+
+    def starts_with(self, prefix: str) -> Iterator[str]:
+        """Yield the words beginning with prefix in sorted order, one at a time."""
+        node = self._find(prefix)
+        if node is None:
+            return
+        stack = [(prefix, node)]
+        while stack:
+            text, node = stack.pop()
+            if node.is_entry:
+                yield text
+            if node.children:
+                for char in sorted(node.children, reverse=True):
+                    stack.append((text + char, node.children[char]))
+
+    def complete(self, prefix: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Return up to k (word, weight) pairs beginning with prefix, highest
+        weight first and ties in sorted order.
+
+        Best-first search keyed by each node's cached subtree maximum: a
+        word is only emitted once no unexplored subtree can beat it, so the
+        work depends on k and the branching along the way, not on how many
+        words share the prefix.
+        """
+        node = self._find(prefix)
+        if node is None or k <= 0:
+            return []
+        result = []
+        # (-score, text, is_node, node): for equal scores and text a word
+        # pops before its own subtree, and a subtree's words sort after it
+        frontier = [(-node.best, prefix, 1, node)]
+        while frontier and len(result) < k:
+            score, text, is_node, node = heappop(frontier)
+            if not is_node:
+                result.append((text, -score))
+                continue
+            if node.is_entry:
+                heappush(frontier, (-node.weight, text, 0, None))
+            if node.children:
+                for char, child in node.children.items():
+                    heappush(frontier, (-child.best, text + char, 1, child))
+        return result
+
+    def fuzzy_search(self, word: str, max_edits: int) -> List[Tuple[str, int]]:
+        """
+        Return (entry, distance) for every word within max_edits
+        Levenshtein edits of word, closest first and ties in sorted order.
+
+        Each node extends its parent's edit-distance row by one character,
+        so words sharing a prefix share that part of the table. A subtree is
+        skipped once its row minimum exceeds max_edits, because the distance
+        can only grow below it.
+        """
+        if max_edits < 0:
+            return []
+        matches = []
+        first_row = list(range(len(word) + 1))
+        root = self.root
+        if root.is_entry and first_row[-1] <= max_edits:
+            matches.append(("", first_row[-1]))
+        stack = [("", root, first_row)]
+        while stack:
+            text, node, previous_row = stack.pop()
+            if not node.children:
+                continue
+            for char, child in node.children.items():
+                row = [previous_row[0] + 1]
+                for i, target in enumerate(word, 1):
+                    row.append(min(row[i - 1] + 1, previous_row[i] + 1, previous_row[i - 1] + (target != char)))
+                if child.is_entry and row[-1] <= max_edits:
+                    matches.append((text + char, row[-1]))
+                if min(row) <= max_edits:
+                    stack.append((text + char, child, row))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def freeze(self) -> 'FrozenTrie':
+        """Return a read-only, compact copy of the trie (see FrozenTrie)."""
+        return FrozenTrie(self.root)
+
+
+def _fold_counts(path: List[TrieNode], depth: int) -> None:
+    """
+    Pop the finished nodes below path[depth], adding each one's word count to
+    its parent. Every finished subtree holds a word of weight 0, so best is 0.
+    """
+    for i in range(len(path) - 1, depth, -1):
+        node = path[i]
+        node.best = 0
+        path[i - 1].count += node.count
+    del path[depth + 1:]
+
+
+def _path_to(root: TrieNode, word: str) -> Optional[List[TrieNode]]:
+    """Nodes from root to the node for word, or None if word is not a trie path."""
+    path = [root]
+    for char in word:
+        children = path[-1].children
+        child = children.get(char) if children else None
+        if child is None:
+            return None
+        path.append(child)
+    return path
+
+
+def _remove_entry(path: List[TrieNode], word: str) -> None:
+    """Unmark the word at the end of path, then prune and fix the cached counts and weights."""
+    end = path[-1]
+    end.is_entry = False
+    end.weight = 0
+    for node in path:
+        node.count -= 1
+    # counts only shrink going down, so everything below the first empty node is empty too
+    for depth in range(1, len(path)):
+        if not path[depth].count:
+            parent = path[depth - 1]
+            del parent.children[word[depth - 1]]
+            if not parent.children:
+                parent.children = None
+            del path[depth:]
+            break
+    _recompute_best(path)
+
+
+def _recompute_best(path: List[TrieNode]) -> None:
+    """Recompute the cached subtree maximum of each node on a root-to-node path, bottom up."""
+    for node in reversed(path):
+        best = node.weight if node.is_entry else NO_WEIGHT
+        if node.children:
+            best = max(best, max(child.best for child in node.children.values()))
+        node.best = best
+
+
+def _copy_node(node: TrieNode) -> TrieNode:
+    clone = TrieNode(node.is_entry)
+    clone.children = dict(node.children) if node.children else None
+    clone.weight, clone.best, clone.count = node.weight, node.best, node.count
+    return clone
+
+
+class ConcurrentTrie(Trie):
+    """
+    Trie for many reader threads alongside writer threads.
+
+    Writers never modify a node that is already reachable. insert() copies
+    the nodes on the path to the word, links the copies to the untouched
+    subtrees, and publishes the result by assigning self.root, a single
+    reference store. Readers take no lock: every lookup reads self.root
+    once and walks an immutable snapshot. Writers serialize on a lock, so
+    concurrent inserts are never lost.
+    """
+
+    def __init__(self, root: Optional[TrieNode] = None) -> None:
+        super().__init__(root)
+        self._write_lock = threading.Lock()
+
+    def insert(self, word: str, weight: Optional[float] = None) -> None:
+        """Insert a word by publishing a new root that shares every untouched subtree."""
+        with self._write_lock:
+            current = _copy_node(self.root)
+            path = [current]
+            for char in word:
+                child = current.children.get(char) if current.children else None
+                child = _copy_node(child) if child else TrieNode()
+                if current.children is None:
+                    current.children = {}
+                current.children[char] = child
+                current = child
+                path.append(child)
+            if current.is_entry and weight is None:
+                # nothing changes, so the copies are dropped unpublished
+                return
+            if not current.is_entry:
+                for node in path:
+                    node.count += 1
+            if weight is None:
+                weight = 0
+            current.is_entry = True
+            current.weight = weight
+            _recompute_best(path)
+            self.root = path[0]
+
+    def delete(self, word: str) -> bool:
+        """Remove a word by publishing a new root; nodes of older snapshots are left intact."""
+        with self._write_lock:
+            path = _path_to(self.root, word)
+            if path is None or not path[-1].is_entry:
+                return False
+            path = [_copy_node(node) for node in path]
+            for depth, char in enumerate(word):
+                path[depth].children[char] = path[depth + 1]
+            _remove_entry(path, word)
+            self.root = path[0]
+            return True
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over the words of a Trie.
+
+    Every trie node becomes a state. Its failure link points to the state
+    for the longest proper suffix of its text that is also a trie path, and
+    its output link to the nearest such suffix that is a whole word. A scan
+    follows goto edges, falls back along failure links on a mismatch, and
+    reports every word ending at the current character by walking output
+    links, so a text of length n costs O(n + matches) however many words
+    there are. The empty word is never reported.
+    """
+
+    def __init__(self, trie: Trie) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[int] = [0]
+        self.words: List[Optional[str]] = [None]  # word ending at each state
+        pending = deque([(trie.root, 0, "")])
+        while pending:
+            node, state, text = pending.popleft()
+            if not node.children:
+                continue
+            for char, child in node.children.items():
+                target = len(self.goto)
+                self.goto[state][char] = target
+                self.goto.append({})
+                self.words.append(text + char if child.is_entry else None)
+                fallback = 0
+                if state:
+                    fallback = self.fail[state]
+                    while fallback and char not in self.goto[fallback]:
+                        fallback = self.fail[fallback]
+                    fallback = self.goto[fallback].get(char, 0)
+                self.fail.append(fallback)
+                self.output.append(fallback if self.words[fallback] is not None else self.output[fallback])
+                pending.append((child, target, text + char))
+
+    def find(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start position, word) for every occurrence of a word in text."""
+        return self.scan([text])
+
+    def scan(self, chunks: Iterable[Union[str, bytes]], encoding: str = "utf-8") -> Iterator[Tuple[int, str]]:
+        """
+        Yield (start position, word) for every occurrence across a stream of
+        chunks, including occurrences that straddle chunk boundaries.
+
+        Positions count characters from the start of the stream. bytes
+        chunks are decoded incrementally with encoding, so a character
+        split between two chunks is still matched.
+        """
+        goto, fail, output, words = self.goto, self.fail, self.output, self.words
+        decoder = None
+        state = offset = 0
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                decoder = decoder or codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk)
+            for i, char in enumerate(chunk, offset + 1):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                match = state if words[state] is not None else output[state]
+                while match:
+                    yield i - len(words[match]), words[match]
+                    match = output[match]
+            offset += len(chunk)
+        if decoder is not None:
+            decoder.decode(b"", final=True)
+
+
+class FrozenTrie:
+    """
+    Read-only trie packed into flat arrays, LOUDS style.
+
+    Nodes are numbered in breadth-first order with each node's children
+    sorted by character. Edges are numbered the same way, so edge e always
+    leads to node e + 1 and no child pointers need to be stored:
+
+        first[node] .. first[node + 1]   edges leaving node
+        labels[edge]                     code point on the edge
+        entries[node]                    1 if a word ends at node
+    """
+
+    root = 0
+
+    def __init__(self, root: Optional[TrieNode] = None) -> None:
+        self.first = array("I")
+        self.labels = array("I")
+        self.entries = bytearray()
+        level = [root or TrieNode()]
+        while level:
+            next_level = []
+            for node in level:
+                self.first.append(len(self.labels))
+                self.entries.append(node.is_entry)
+                if node.children:
+                    for char in sorted(node.children):
+                        self.labels.append(ord(char))
+                        next_level.append(node.children[char])
+            level = next_level
+        self.first.append(len(self.labels))
+        self.count: int = self.entries.count(1)
+        self.mapped: Optional[mmap.mmap] = None
+
+    def save(self, path) -> None:
+        """Write the trie to path in the versioned binary format that load() maps back in."""
+        header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(self.entries), len(self.labels), self.count)
+        save_arrays(path, header, self, _SAVED_ARRAYS, "trie file")
+
+    @classmethod
+    def load(cls, path) -> 'FrozenTrie':
+        """
+        Open a trie written by save() with mmap, without deserializing it.
+
+        The arrays are memoryviews straight into the mapped file, so lookups
+        read the page cache directly and every process loading the same file
+        shares one copy. The trie is read-only; call close() to release the
+        mapping.
+        """
+        def lengths(fields: Tuple) -> Dict[str, int]:
+            _, _, nodes, edges, _ = fields
+            return {"first": nodes + 1, "labels": edges, "entries": nodes}
+
+        mapped, fields, views = load_arrays(path, _HEADER, _MAGIC, _FORMAT_VERSION, _SAVED_ARRAYS, lengths, "trie file")
+        trie = cls()
+        for name, view in views.items():
+            setattr(trie, name, view)
+        trie.count = fields[4]
+        trie.mapped = mapped
+        return trie
+
+    def close(self) -> None:
+        """Release the file mapping of a trie opened with load(); the trie is empty afterwards."""
+        if self.mapped is None:
+            return
+        release_arrays(self, _SAVED_ARRAYS)
+        self.__init__()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word: str) -> bool:
+        node = 0
         for char in word:
-            if char not in current.children:
-                current.children[char] = TrieNode()
-            current = current.children[char]
-        current.is_entry = True
+            node = self.child(node, char)
+            if node < 0:
+                return False
+        return self.entries[node] == 1
+
+    def child(self, node: int, char: str) -> int:
+        """Node reached from node along char, or -1 if there is no such edge."""
+        labels = self.labels
+        hi = self.first[node + 1]
+        code = ord(char)
+        edge = bisect_left(labels, code, self.first[node], hi)
+        if edge == hi or labels[edge] != code:
+            return -1
+        return edge + 1
+
+
+class RadixNode:
+    __slots__ = ("label", "is_entry", "children")
+
+    def __init__(self, label: str = "", is_entry: bool = False) -> None:
+        self.label: str = label  # edge label leading into this node
+        self.is_entry: bool = is_entry
+        # keyed by the first character of each child's label
+        self.children: Optional[Dict[str, 'RadixNode']] = None
+
+
+class RadixTrie:
+    """
+    Path-compressed trie: chains of single-child nodes collapse into one
+    edge labelled with the whole substring, so long keys sharing few
+    branch points (URLs, file paths) take a handful of hops instead of one
+    per character.
+    """
+
+    def __init__(self) -> None:
+        self.root: RadixNode = RadixNode()
+
+    def insert(self, word: str) -> None:
+        """Insert a word, splitting an edge where the word leaves its label."""
+        node = self.root
+        i, n = 0, len(word)
+        while i < n:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(word[i])
+            if child is None:
+                node.children[word[i]] = RadixNode(word[i:], is_entry=True)
+                return
+            label = child.label
+            if word.startswith(label, i):
+                node = child
+                i += len(label)
+                continue
+            # word diverges inside the label: split it at the common prefix
+            common = 1
+            limit = min(len(label), n - i)
+            while common < limit and label[common] == word[i + common]:
+                common += 1
+            middle = RadixNode(label[:common])
+            child.label = label[common:]
+            middle.children = {child.label[0]: child}
+            node.children[word[i]] = middle
+            i += common
+            if i == n:
+                middle.is_entry = True
+            else:
+                middle.children[word[i]] = RadixNode(word[i:], is_entry=True)
+            return
+        node.is_entry = True
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        i, n = 0, len(word)
+        while i < n:
+            if not node.children:
+                return False
+            child = node.children.get(word[i])
+            if child is None or not word.startswith(child.label, i):
+                return False
+            node = child
+            i += len(child.label)
+        return node.is_entry
         
-def trieSearch(trie: Optional[Trie], target: str):
+def trieSearch(trie: Optional[Union[Trie, FrozenTrie, RadixTrie]], target: str):
+  if isinstance(trie, (FrozenTrie, RadixTrie)):
+    return target in trie
   if not trie or not trie.root:
     return False
   
   current = trie.root
   
   for char in target:
-    if char not in current.children:
+    if not current.children or char not in current.children:
       return False
     current = current.children[char]
   
-  return current.is_entry
\ No newline at end of file
+  return current.is_entry
+
+def trie_search_many(trie: Optional[Union[Trie, FrozenTrie, RadixTrie]], targets: Iterable[str]) -> List[bool]:
+    """
+    trieSearch for a batch of targets, answered in input order.
+
+    The batch is visited in sorted order, where neighbours share their
+    longest common prefix, so each target resumes from the node where it
+    leaves the previous one instead of walking down from the root again.
+    Repeated targets are answered without walking at all.
+    """
+    targets = list(targets)
+    result = [False] * len(targets)
+    if trie is None or (isinstance(trie, Trie) and not trie.root):
+        return result
+    if isinstance(trie, RadixTrie):
+        return [target in trie for target in targets]
+
+    if isinstance(trie, FrozenTrie):
+        entries, child = trie.entries, trie.child
+
+        def step(node, char):
+            node = child(node, char)
+            return None if node < 0 else node
+
+        def found(node):
+            return entries[node] == 1
+    else:
+        def step(node, char):
+            children = node.children
+            return children.get(char) if children else None
+
+        def found(node):
+            return node.is_entry
+
+    path = [trie.root]  # path[i] is the node for previous[:i], as far as it exists
+    previous, answer = None, False
+    for index in sorted(range(len(targets)), key=targets.__getitem__):
+        target = targets[index]
+        if target == previous:
+            result[index] = answer
+            continue
+        common = 0
+        if previous is not None:
+            limit = min(len(target), len(path) - 1)
+            while common < limit and target[common] == previous[common]:
+                common += 1
+            del path[common + 1:]
+        node = path[-1]
+        answer = False
+        for position in range(common, len(target)):
+            node = step(node, target[position])
+            if node is None:
+                break
+            path.append(node)
+        else:
+            answer = found(node)
+        result[index] = answer
+        previous = target
+    return result